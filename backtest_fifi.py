@@ -4,7 +4,9 @@ import csv
 import json
 import os
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from collections import Counter, defaultdict
 from dotenv import load_dotenv
@@ -19,6 +21,7 @@ CSV_PATH = "fifi_messages.csv"
 OUTPUT_PATH = "fifi_backtest_results.json"
 PROGRESS_INTERVAL = 50  # Print progress every N messages
 FIFI_USERNAME = "sauced2002"
+CONCURRENCY = 8  # Parallel OpenAI calls (each worker thread gets its own parser)
 
 def load_messages(csv_path):
     """Load messages from CSV in chronological order (oldest first)."""
@@ -72,11 +75,33 @@ def run_backtest():
         sys.exit(1)
 
     client = OpenAI(api_key=api_key)
-    parser = FiFiParser(client, 1368713891072315483, {
+    parser_config = {
         "name": "FiFi",
         "model": "gpt-4o-mini",
         "color": 15277667
-    })
+    }
+
+    # Parsers hold per-message state, so each worker thread gets its own instance
+    local = threading.local()
+
+    def parse_one(message_meta, message_history):
+        parser = getattr(local, "parser", None)
+        if parser is None:
+            parser = local.parser = FiFiParser(client, 1368713891072315483, parser_config)
+
+        # Simple logger
+        def log_func(text):
+            pass  # Suppress parse logs during backtest
+
+        try:
+            return parser.parse_message(
+                message_meta,
+                datetime.now(timezone.utc),
+                log_func,
+                message_history=message_history
+            ), None
+        except Exception as e:
+            return None, e
 
     messages = load_messages(CSV_PATH)
     total = len(messages)
@@ -94,6 +119,8 @@ def run_backtest():
 
     start_time = time.time()
 
+    # Build every task up front; history only depends on the CSV, not on earlier parses
+    tasks = []
     for idx, msg in enumerate(messages):
         # Only parse FiFi's messages
         if msg.get("author_name") != FIFI_USERNAME:
@@ -108,56 +135,53 @@ def run_backtest():
         # Build context
         message_meta = build_message_meta(msg)
         message_history = build_message_history(messages, idx, limit=10)
+        tasks.append((idx, msg, content, message_meta, message_history))
 
-        # Simple logger
-        def log_func(text):
-            pass  # Suppress parse logs during backtest
+    # Backfill isn't latency-critical: overlap the OpenAI round-trips, record in order
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        futures = [pool.submit(parse_one, meta, history) for _, _, _, meta, history in tasks]
 
-        try:
-            parsed_results, latency_ms = parser.parse_message(
-                message_meta,
-                datetime.now(timezone.utc),
-                log_func,
-                message_history=message_history
-            )
+        for (idx, msg, content, _, _), future in zip(tasks, futures):
+            parsed, error = future.result()
             api_calls += 1
-            total_latency += latency_ms
-
-            # Record results
-            for pr in parsed_results:
-                action = pr.get("action", "unknown")
-                action_counts[action] += 1
-
-            result_entry = {
-                "idx": idx,
-                "message_id": msg.get("message_id", ""),
-                "timestamp": msg.get("timestamp", ""),
-                "content": content[:300],
-                "is_reply": msg.get("is_reply", "False"),
-                "reply_to_content": msg.get("reply_to_content", "")[:200],
-                "parsed": parsed_results,
-                "latency_ms": latency_ms,
-                "has_alert_ping": "<@&1369304547356311564>" in content
-            }
-            results.append(result_entry)
 
-        except Exception as e:
-            errors.append({
-                "idx": idx,
-                "message_id": msg.get("message_id", ""),
-                "content": content[:200],
-                "error": str(e)
-            })
-            api_calls += 1
+            if error is None:
+                parsed_results, latency_ms = parsed
+                total_latency += latency_ms
+
+                # Record results
+                for pr in parsed_results:
+                    action = pr.get("action", "unknown")
+                    action_counts[action] += 1
+
+                result_entry = {
+                    "idx": idx,
+                    "message_id": msg.get("message_id", ""),
+                    "timestamp": msg.get("timestamp", ""),
+                    "content": content[:300],
+                    "is_reply": msg.get("is_reply", "False"),
+                    "reply_to_content": msg.get("reply_to_content", "")[:200],
+                    "parsed": parsed_results,
+                    "latency_ms": latency_ms,
+                    "has_alert_ping": "<@&1369304547356311564>" in content
+                }
+                results.append(result_entry)
+            else:
+                errors.append({
+                    "idx": idx,
+                    "message_id": msg.get("message_id", ""),
+                    "content": content[:200],
+                    "error": str(error)
+                })
 
-        # Progress reporting
-        if (idx + 1) % PROGRESS_INTERVAL == 0:
-            elapsed = time.time() - start_time
-            rate = api_calls / elapsed if elapsed > 0 else 0
-            print(f"[{idx+1}/{total}] API calls: {api_calls}, "
-                  f"Actions: {dict(action_counts)}, "
-                  f"Errors: {len(errors)}, "
-                  f"Rate: {rate:.1f} calls/sec")
+            # Progress reporting
+            if api_calls % PROGRESS_INTERVAL == 0:
+                elapsed = time.time() - start_time
+                rate = api_calls / elapsed if elapsed > 0 else 0
+                print(f"[{idx+1}/{total}] API calls: {api_calls}, "
+                      f"Actions: {dict(action_counts)}, "
+                      f"Errors: {len(errors)}, "
+                      f"Rate: {rate:.1f} calls/sec")
 
     elapsed = time.time() - start_time
 
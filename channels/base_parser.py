@@ -1,25 +1,219 @@
 # channels/base_parser.py
+import copy
+import functools
 import json
 import hashlib
+import heapq
+import logging
+import operator
+import threading
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone, date, timedelta
-from typing import Dict, List, Optional, Tuple, Union, Literal
+from typing import Annotated, Callable, Dict, List, Optional, Tuple, Union, Literal
 from openai import OpenAI
+import orjson
 import re
-from pydantic import BaseModel, Field, field_validator, ValidationError
+from pydantic import BaseModel, Field, TypeAdapter, field_validator, ValidationError
+
+
+# Module logger for parser internals; user-facing messages still go through the logger callable
+_LOG = logging.getLogger('channel_parser')
+
+# Reasoning model families that reject a temperature parameter
+_NO_TEMPERATURE_MODELS = ("gpt-5", "o1", "o3", "o4")
+
+# Transient OpenAI failures worth retrying: rate limits, timeouts, server errors
+_RETRYABLE_RE = re.compile(r'rate limit|429|timeout|50[0234]|connection', re.IGNORECASE)
+
+# Worker threads for hedged cascades (the cheap and fallback attempts race here)
+_HEDGE_POOL = ThreadPoolExecutor(max_workers=10, thread_name_prefix="openai-hedge")
+
+
+# ============= DATE PARSING PATTERNS (compiled once at import) =============
+
+# (date, "YYYY-MM-DD") for the last UTC day seen; swapped as one tuple, so thread-safe
+_TODAY_MEMO: Tuple[Optional[date], str] = (None, "")
+
+
+def today_utc_str(now: Optional[datetime] = None) -> str:
+    """Today's UTC date (or now's) as YYYY-MM-DD, formatted only once per day."""
+    global _TODAY_MEMO
+    today = (now or datetime.now(timezone.utc)).date()
+    memo_date, memo_str = _TODAY_MEMO
+    if memo_date == today:
+        return memo_str
+    today_str = today.isoformat()
+    _TODAY_MEMO = (today, today_str)
+    return today_str
+
+
+_YMD_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+def _is_ymd(s: str) -> bool:
+    """Exact YYYY-MM-DD check without the regex engine (the LLM's usual output)."""
+    return (len(s) == 10 and s[4] == '-' and s[7] == '-'
+            and s[:4].isdecimal() and s[5:7].isdecimal() and s[8:].isdecimal())
+
+
+# Every non-monthly expiration format in one pass; the named groups say which one matched:
+#   y1/m1/d1    YYYY-MM-DD (already correct)
+#   m2/d2[/y2]  MM/DD[/YYYY] or MM-DD[-YYYY] (same separator throughout)
+#   mon/d3[/y3] "Jan 16" or "January 16 2026"
+_DATE_RE = re.compile(
+    r'^(?:(?P<y1>\d{4})-(?P<m1>\d{1,2})-(?P<d1>\d{1,2})'
+    r'|(?P<m2>\d{1,2})(?P<sep>[/-])(?P<d2>\d{1,2})(?:(?P=sep)(?P<y2>\d{4}))?'
+    r'|(?P<mon>[A-Za-z]{3,})\s+(?P<d3>\d{1,2})(?:\s+(?P<y3>\d{4}))?)$'
+)
+
+_MONTH_MAP = {
+    'jan': 1, 'january': 1,
+    'feb': 2, 'february': 2,
+    'mar': 3, 'march': 3,
+    'apr': 4, 'april': 4,
+    'may': 5,
+    'jun': 6, 'june': 6,
+    'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8,
+    'sep': 9, 'september': 9,
+    'oct': 10, 'october': 10,
+    'nov': 11, 'november': 11,
+    'dec': 12, 'december': 12
+}
+
+def _compute_third_friday(year: int, month: int) -> str:
+    """Monthly option expiration (third Friday) as YYYY-MM-DD."""
+    # First Friday falls on day 1 + (4 - weekday of the 1st) % 7
+    first_dow = date(year, month, 1).weekday()  # Mon=0..Sun=6
+    return f"{year}-{month:02d}-{15 + ((4 - first_dow) % 7):02d}"
+
+
+# Third Fridays for the years option chains list (this year through LEAPS), built at import
+_THIRD_FRIDAYS = {
+    (year, month): _compute_third_friday(year, month)
+    for year in range(date.today().year - 1, date.today().year + 6)
+    for month in range(1, 13)
+}
+
+
+def _third_friday(year: int, month: int) -> str:
+    """Table lookup, computing on demand for years outside the precomputed range."""
+    result = _THIRD_FRIDAYS.get((year, month))
+    return result if result is not None else _compute_third_friday(year, month)
+
+
+# Monthly expirations: "JAN 2026", "Jan 2026", "January 2026"
+_MONTH_RE = re.compile(
+    r'^(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?'
+    r'|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\s+(\d{4})$',
+    re.IGNORECASE,
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_monthly(expiration_str: str) -> Optional[str]:
+    """Pure core of _parse_monthly_expiration: third Friday for "JAN 2026"-style input, else None."""
+    match = _MONTH_RE.match(expiration_str.strip())
+    if not match:
+        return None
+    # _MONTH_RE only admits names present in _MONTH_MAP
+    return _third_friday(int(match.group(2)), _MONTH_MAP[match.group(1).lower()])
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_date(date_str: str, today: date) -> Tuple[str, Optional[Tuple[str, str]]]:
+    """
+    Pure core of _smart_year_detection, memoized per (date_str, today) so the
+    cache stays correct across days. Returns (result, note) where note is an
+    optional (emoji, message) for the caller to log.
+    """
+    # Handle 0DTE case - return today's date
+    if date_str.lower() in ('0dte', 'today'):
+        return today.strftime('%Y-%m-%d'), None
+
+    match = _DATE_RE.match(date_str)
+    if not match:
+        # If no pattern matched, return as-is
+        return date_str, None
+
+    g = match.groupdict()
+    try:
+        if g['y1']:
+            # YYYY-MM-DD format - already correct
+            return f"{int(g['y1'])}-{int(g['m1']):02d}-{int(g['d1']):02d}", None
+
+        if g['mon']:
+            # "Jan 16" / "January 16 2026"
+            month = _MONTH_MAP.get(g['mon'][:3].lower())
+            if month is None:
+                raise ValueError(g['mon'])  # Same outcome strptime('%b') gave for non-month words
+            day, year = int(g['d3']), g['y3']
+        else:
+            # MM/DD[/YYYY] or MM-DD[-YYYY]
+            month, day, year = int(g['m2']), int(g['d2']), g['y2']
+
+        if year:
+            return date(int(year), month, day).strftime('%Y-%m-%d'), None
+
+        # No year given - use smart year detection
+        current_year = today.year
+
+        # Try to create date for current year
+        target_date = date(current_year, month, day)
+
+        # If the date has already passed this year, assume next year
+        if target_date < today:
+            target_date = date(current_year + 1, month, day)
+            note = ("🗓️", f"Date {date_str} has passed in {current_year}, using {current_year + 1}")
+        else:
+            note = ("🗓️", f"Date {date_str} is future in {current_year}, using {current_year}")
+
+        return target_date.strftime('%Y-%m-%d'), note
+
+    except ValueError:
+        # Invalid date (e.g., Feb 30), return as-is
+        return date_str, ("⚠️", f"Invalid date format: {date_str}")
+
+
+# Fully dated formats the LLM echoes back verbatim; one C-level strptime, no year heuristics
+_FAST_DATE_FORMATS = (
+    (re.compile(r'\d{1,2}/\d{1,2}/\d{4}'), '%m/%d/%Y'),
+    (re.compile(r'\d{1,2}/\d{1,2}/\d{2}'), '%m/%d/%y'),
+    (re.compile(r'\d{1,2}-\d{1,2}-\d{4}'), '%m-%d-%Y'),
+    (re.compile(r'[A-Za-z]{3}\s+\d{1,2}\s+\d{4}'), '%b %d %Y'),
+    (re.compile(r'[A-Za-z]{4,}\s+\d{1,2}\s+\d{4}'), '%B %d %Y'),
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _resolve_fast(expiration_str: str) -> Optional[str]:
+    """YYYY-MM-DD for an explicitly dated expiration, else None (caller falls back)."""
+    for pattern, fmt in _FAST_DATE_FORMATS:
+        if pattern.fullmatch(expiration_str):
+            try:
+                return datetime.strptime(expiration_str, fmt).strftime('%Y-%m-%d')
+            except ValueError:
+                return None  # e.g. "Sept 16 2026" or Feb 30: leave it to the fallbacks
+    return None
 
 
 # ============= RESPONSE CACHING FOR LATENCY OPTIMIZATION =============
 
 class ParseCache:
     """
-    In-memory cache for parsed responses with TTL support.
+    In-memory LRU cache for parsed responses with TTL support and a size cap.
     Uses normalized message content as key for exact matching.
     """
-    def __init__(self, ttl_seconds: int = 300):  # 5 minute default TTL
-        self._cache: Dict[str, Tuple[any, float]] = {}
+    def __init__(self, ttl_seconds: int = 300, max_size: int = 1024):  # 5 minute default TTL
+        self._cache: "OrderedDict[str, Tuple[any, float]]" = OrderedDict()
         self._ttl = ttl_seconds
+        self._max_size = max_size
+        self._expiry_heap: List[Tuple[float, str]] = []  # (expires_at, key); may hold stale keys
+        self._history_memo: Tuple[Tuple[str, ...], bytes] = ((), b"")
+        self._lock = threading.Lock()  # Parsers run in executor threads
         self._hits = 0
         self._misses = 0
 
@@ -30,41 +224,79 @@ class ParseCache:
         # Lowercase, strip whitespace, collapse multiple spaces
         return " ".join(str(message).lower().split())
 
-    def _get_cache_key(self, message_meta, message_history: Optional[List[str]] = None) -> str:
-        """Generate cache key from message metadata and history context."""
+    def make_key(self, message_meta, message_history: Optional[List[str]] = None) -> str:
+        """
+        Generate cache key from message metadata and history context.
+        Parsers compute it once per message and pass it to get()/set() as key=.
+        """
+        # Feed the normalized parts to the hasher as bytes instead of concatenating strings
+        hasher = hashlib.blake2b(digest_size=16)
         if isinstance(message_meta, tuple):
             # For replies: combine both messages
-            normalized = self._normalize_message(str(message_meta[0])) + "|" + self._normalize_message(str(message_meta[1]))
+            hasher.update(self._normalize_message(str(message_meta[0])).encode())
+            hasher.update(b"|")
+            hasher.update(self._normalize_message(str(message_meta[1])).encode())
         else:
-            normalized = self._normalize_message(str(message_meta))
+            hasher.update(self._normalize_message(str(message_meta)).encode())
 
         # Include message history in the key to avoid stale results
         # when same message appears in different conversation contexts
         if message_history:
-            history_str = "|".join(self._normalize_message(msg) for msg in message_history)
-            normalized = normalized + "||" + history_str
+            hasher.update(b"||")
+            hasher.update(self._history_digest(message_history))
 
-        # Hash for consistent key length
-        return hashlib.md5(normalized.encode()).hexdigest()
+        # Fixed-length key
+        return hasher.hexdigest()
 
-    def get(self, message_meta, message_history: Optional[List[str]] = None) -> Optional[Tuple[List[Dict], float]]:
+    def _history_digest(self, message_history: List[str]) -> bytes:
+        """
+        Digest of the normalized history. The last history seen is memoized, since
+        a burst of messages (and retries) usually share the same context window.
+        """
+        history_key = tuple(message_history)
+        memo_key, memo_digest = self._history_memo
+        if memo_key == history_key:
+            return memo_digest
+
+        hasher = hashlib.blake2b(digest_size=16)
+        for j, msg in enumerate(message_history):
+            if j:
+                hasher.update(b"|")
+            hasher.update(self._normalize_message(msg).encode())
+        digest = hasher.digest()
+        self._history_memo = (history_key, digest)  # Single assignment: safe across threads
+        return digest
+
+    def get(self, message_meta, message_history: Optional[List[str]] = None, *, key: Optional[str] = None) -> Optional[Tuple[List[Dict], float]]:
         """Get cached result if exists and not expired."""
-        key = self._get_cache_key(message_meta, message_history)
-        if key in self._cache:
-            result, timestamp = self._cache[key]
-            if time.time() - timestamp < self._ttl:
-                self._hits += 1
-                return result
-            else:
+        if key is None:
+            key = self.make_key(message_meta, message_history)
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                result, timestamp = entry
+                if time.time() - timestamp < self._ttl:
+                    self._cache.move_to_end(key)
+                    self._hits += 1
+                    return result
                 # Expired, remove from cache
                 del self._cache[key]
-        self._misses += 1
+            self._misses += 1
         return None
 
-    def set(self, message_meta, result: Tuple[List[Dict], float], message_history: Optional[List[str]] = None):
-        """Cache a parsing result."""
-        key = self._get_cache_key(message_meta, message_history)
-        self._cache[key] = (result, time.time())
+    def set(self, message_meta, result: Tuple[List[Dict], float], message_history: Optional[List[str]] = None, *, key: Optional[str] = None):
+        """Cache a parsing result, evicting the least recently used entries past max_size."""
+        if key is None:
+            key = self.make_key(message_meta, message_history)
+        now = time.time()
+        with self._lock:
+            self._cache[key] = (result, now)
+            self._cache.move_to_end(key)
+            heapq.heappush(self._expiry_heap, (now + self._ttl, key))
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+            # Drain expired heads here too so the heap stays bounded by one TTL window
+            self._evict_expired(now)
 
     def get_stats(self) -> Dict[str, int]:
         """Get cache statistics."""
@@ -78,16 +310,29 @@ class ParseCache:
             "cache_size": len(self._cache)
         }
 
+    def clear(self):
+        """Drop every entry (stats are kept)."""
+        with self._lock:
+            self._cache.clear()
+            self._expiry_heap.clear()
+
     def clear_expired(self):
-        """Remove expired entries from cache."""
-        current_time = time.time()
-        expired_keys = [k for k, (_, ts) in self._cache.items() if current_time - ts >= self._ttl]
-        for key in expired_keys:
-            del self._cache[key]
+        """Remove expired entries from cache (O(expired), via the expiry heap)."""
+        with self._lock:
+            self._evict_expired(time.time())
+
+    def _evict_expired(self, now: float):
+        """Pop heap heads that have expired; skip keys refreshed or evicted since. Caller holds the lock."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            _, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            if entry is not None and now - entry[1] >= self._ttl:
+                del self._cache[key]
 
 
 # Global cache instance (shared across all parsers)
-_parse_cache = ParseCache(ttl_seconds=300)
+_parse_cache = ParseCache(ttl_seconds=300, max_size=1024)
 
 
 def get_parse_cache() -> ParseCache:
@@ -95,6 +340,20 @@ def get_parse_cache() -> ParseCache:
     return _parse_cache
 
 
+# ============= OPENAI RESPONSE CACHE =============
+# Exact-match LRU in front of the OpenAI call, keyed by (models, prompt digest).
+# Sits below ParseCache: it also catches identical prompts reached via a different
+# message/history key. Prompts embed today's date, so entries stop matching at rollover.
+
+RESPONSE_CACHE_MAXSIZE = 4096
+_RESPONSE_CACHE: "OrderedDict[Tuple[str, str, str], Union[Dict, List]]" = OrderedDict()
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+# Singleflight: prompts currently being sent, keyed like _RESPONSE_CACHE.
+_INFLIGHT: Dict[Tuple[str, str, str], Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
 # ============= PYDANTIC SCHEMAS FOR ALERT VALIDATION =============
 
 class BuyAlert(BaseModel):
@@ -206,7 +465,7 @@ class CommentaryAlert(BaseModel):
     message: Optional[str] = None
 
 
-# Map action types to their schema classes
+# Map action types to their schema classes (validation itself goes through _ALERT_ADAPTER)
 ALERT_SCHEMAS = {
     "buy": BuyAlert,
     "trim": TrimAlert,
@@ -215,40 +474,158 @@ ALERT_SCHEMAS = {
 }
 
 
+# JSON Schema for OpenAI structured outputs (single trade object).
+# Strict mode requires every property to be listed in "required", so optional
+# fields are expressed as nullable types and stripped after parsing.
+TRADE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "action": {"type": "string", "enum": ["buy", "trim", "exit", "null"]},
+        "ticker": {"type": ["string", "null"]},
+        "strike": {"type": ["number", "null"]},
+        "type": {"type": ["string", "null"], "enum": ["call", "put", None]},
+        "expiration": {"type": ["string", "null"]},
+        "price": {"type": ["number", "string", "null"]},
+        "size": {"type": ["string", "null"], "enum": ["full", "half", "small", None]},
+    },
+    "required": ["action", "ticker", "strike", "type", "expiration", "price", "size"],
+    "additionalProperties": False,
+}
+
+# Structured outputs need an object root, so multi-trade prompts get {"trades": [...]}
+# (unwrapped back into the array by _unwrap_response).
+TRADES_SCHEMA = {
+    "type": "object",
+    "properties": {"trades": {"type": "array", "items": TRADE_SCHEMA}},
+    "required": ["trades"],
+    "additionalProperties": False,
+}
+
+
+# Discriminated union on "action": pydantic-core dispatches to the right schema itself
+Alert = Annotated[Union[BuyAlert, TrimAlert, ExitAlert, CommentaryAlert], Field(discriminator='action')]
+_ALERT_ADAPTER = TypeAdapter(Alert)
+
+
 def validate_alert(data: dict, logger=print) -> Optional[BaseModel]:
     """
     Validate parsed alert data against the appropriate Pydantic schema.
     Returns validated model instance or None if validation fails.
     """
-    action = data.get('action', '').lower()
-    schema_class = ALERT_SCHEMAS.get(action)
-
-    if not schema_class:
-        logger(f"⚠️ Unknown action type: {action}")
-        return None
-
     try:
-        validated = schema_class(**data)
-        return validated
+        return _ALERT_ADAPTER.validate_python(data)
     except ValidationError as e:
-        logger(f"⚠️ Validation failed for {action} alert: {e.errors()}")
+        errors = e.errors()
+        if errors and errors[0]['type'] in ('union_tag_invalid', 'union_tag_not_found'):
+            logger(f"⚠️ Unknown action type: {data.get('action')}")
+        else:
+            logger(f"⚠️ Validation failed for {data.get('action')} alert: {errors}")
         return None
 
+# Every known action variant mapped to its canonical action (built once at import)
+_ACTION_MAP = {
+    # Buy variations - all map to "buy"
+    **dict.fromkeys(["buy", "entry", "bto", "long", "open", "enter", "bought",
+                     "buying", "opening", "longing", "purchase", "purchasing"], "buy"),
+    # Trim variations - all map to "trim"
+    **dict.fromkeys(["trim", "scale", "partial", "reduce", "take", "trimming",
+                     "scaling", "partial_exit", "scale_out", "take_profit",
+                     "tp", "partial_close", "half", "some"], "trim"),
+    # Exit variations - all map to "exit"
+    **dict.fromkeys(["exit", "close", "stop", "stc", "sell", "out", "sold",
+                     "exiting", "closing", "selling", "stopped", "full_exit",
+                     "all_out", "done", "finished", "complete"], "exit"),
+    # Stop loss variations - also map to "exit"
+    **dict.fromkeys(["stop_loss", "sl", "stopped_out", "stop_hit"], "exit"),
+    # Non-actionable variations - all map to "null"
+    **dict.fromkeys(["null", "comment", "update", "watching", "none", "",
+                     "monitor", "hold", "holding", "wait", "waiting",
+                     "considering", "thinking", "maybe", "possibly"], "null"),
+}
+
+# Ledger Position attribute → compact key in the prompt's OPEN POSITIONS JSON
+_POSITION_FIELDS = operator.attrgetter("ticker", "strike", "option_type", "expiration", "avg_cost_basis", "total_quantity")
+_POSITION_KEYS = ("ticker", "strike", "type", "exp", "avg_cost", "qty")
+
+# (id(SIZE_MAP), size string) → _size_by_substring result. Odd LLM size strings
+# ("1/5th size (LOTTO TRADE)") recur, so the substring walk runs once per string.
+_SIZE_SUBSTRING_MEMO: Dict[Tuple[int, str], Optional[str]] = {}
+_SIZE_SUBSTRING_MEMO_MAX = 1024
+
+# Minimum fields per action for validate_parsed_data.
+# Buys need the full contract; trims/exits can be resolved from the ledger.
+_REQUIRED_FIELDS = {
+    "buy": ("ticker", "strike", "type", "expiration", "price"),
+    "trim": ("ticker",),
+    "exit": ("ticker",),
+}
+
+
+# Per-message part of a SYSTEM_TEMPLATE parser's prompt, sent as the user message after the static rules
+_USER_TEMPLATE = """--- OPEN POSITIONS ---
+{open_positions}
+
+--- CONTEXT ---
+ALERT PING: {alert_ping}
+
+--- MESSAGE TO PARSE ---
+PRIMARY: "{primary_message}"
+"""
+
+
 class BaseParser(ABC):
     """
     An abstract base class for channel message parsers.
     It handles the common logic of calling the OpenAI API, parsing JSON,
     and basic error handling, leaving channel-specific logic to subclasses.
     """
+    # Fixed per-instance layout for the common state. Every concrete parser declares
+    # __slots__ as well (just its own attributes, usually none), so instances have no __dict__.
+    __slots__ = (
+        "client", "channel_id", "name", "model", "cheap_model",
+        "fallback_model", "stream", "hedge_after_ms", "_base_params", "_cascade_stats", "color",
+        "_current_message_meta", "_message_history", "position_ledger",
+        "_prompt_template", "_primary_lower_memo", "_history_memo", "_open_positions_memo",
+    )
+
+    # JSON Schema for structured outputs: TRADE_SCHEMA for prompts that return a
+    # single trade object, TRADES_SCHEMA for several; None keeps plain JSON mode.
+    RESPONSE_SCHEMA: Optional[dict] = None
+
+    # Static rules and few-shot examples sent as the system message (see build_system_prompt).
+    # Slots: {today_str}, {current_year}, {next_year}, {weekly_exp}, {next_week_exp}.
+    SYSTEM_TEMPLATE: Optional[str] = None
+
+    # Role mention that marks an official alert, reported as ALERT PING by _build_user_prompt
+    _ALERT_PING_TOKEN: Optional[str] = None
+
+    # Size keyword → "full"/"half"/"small", for parsers that normalize free-form sizes
+    SIZE_MAP: Dict[str, str] = {}
+    CANONICAL_SIZES = ("full", "half", "small")  # tuple: == compare, safe for unhashable LLM values
+
     def __init__(self, openai_client: OpenAI, channel_id: int, config: dict, position_ledger=None):
         self.client = openai_client
         self.channel_id = channel_id
         self.name = config["name"]
         self.model = config.get("model", "gpt-4o-2024-08-06")
+        # Model cascade: cheap model first, fallback model on invalid output
+        self.cheap_model = config.get("cheap_model", "gpt-4o-mini")
+        self.fallback_model = config.get("fallback_model", self.model)
+        # Stream completions (overlaps transfer with the request instead of one final payload)
+        self.stream = config.get("stream", False)
+        # Start the fallback model alongside a cheap model still pending after this many ms (None = sequential)
+        self.hedge_after_ms = config.get("hedge_after_ms")
+        # Request params are fixed per model, so build them once
+        self._base_params = {m: self._build_base_params(m) for m in (self.cheap_model, self.fallback_model)}
+        self._cascade_stats = {"calls": 0, "fallbacks": 0}
         # Store the color from the config, with a default fallback
         self.color = config.get("color", 7506394)  # Default to gray if not specified
         self._current_message_meta = None
         self._message_history = []  # Recent messages for context
+        self._prompt_template = None  # (date, text) memo for _cached_for_today
+        self._primary_lower_memo = None  # (message_meta, lowered primary) for _primary_message_lower
+        self._history_memo = None  # (30s bucket, history copy, text) for _format_history_with_deltas
+        self._open_positions_memo = None  # (ledger version, positions JSON) for _get_open_positions_json
         self.position_ledger = position_ledger
 
     @abstractmethod
@@ -259,6 +636,17 @@ class BaseParser(ABC):
         """
         pass
 
+    def build_system_prompt(self) -> Optional[str]:
+        """
+        Optional static instructions sent as the system message ahead of build_prompt()'s
+        user message. Keeping them byte-identical across calls lets OpenAI's automatic
+        prefix caching reuse them; None (the default) sends the user message alone.
+        Parsers that set SYSTEM_TEMPLATE get it rendered once per UTC day.
+        """
+        if self.SYSTEM_TEMPLATE is None:
+            return None
+        return self._cached_for_today(self._render_system_prompt)
+
     def _standardize_action(self, action: str) -> str:
         """
         Standardize action values across all parsers to ensure consistency.
@@ -266,48 +654,56 @@ class BaseParser(ABC):
         """
         if not action:
             return "null"
-        
-        # Convert to string and normalize
-        action_lower = str(action).lower().strip()
-        
-        # Buy variations - all map to "buy"
-        if action_lower in ["buy", "entry", "bto", "long", "open", "enter", "bought", 
-                           "buying", "opening", "longing", "purchase", "purchasing"]:
-            return "buy"
-        
-        # Trim variations - all map to "trim"
-        elif action_lower in ["trim", "scale", "partial", "reduce", "take", "trimming",
-                             "scaling", "partial_exit", "scale_out", "take_profit",
-                             "tp", "partial_close", "half", "some"]:
-            return "trim"
-        
-        # Exit variations - all map to "exit"
-        elif action_lower in ["exit", "close", "stop", "stc", "sell", "out", "sold",
-                             "exiting", "closing", "selling", "stopped", "full_exit",
-                             "all_out", "done", "finished", "complete"]:
-            return "exit"
-        
-        # Stop loss variations - also map to "exit" 
-        elif action_lower in ["stop_loss", "sl", "stopped_out", "stop_hit", "stopped"]:
-            return "exit"
-        
-        # Non-actionable variations - all map to "null"
-        elif action_lower in ["null", "comment", "update", "watching", "none", "",
-                             "monitor", "hold", "holding", "wait", "waiting",
-                             "considering", "thinking", "maybe", "possibly"]:
-            return "null"
-        
-        # If we don't recognize it, log it and return as-is (lowercase)
+
+        # Fast path: JSON actions are usually already a clean lowercase str
+        if type(action) is str:
+            canonical = _ACTION_MAP.get(action)
+            if canonical is not None:
+                return canonical
+            action_lower = action.strip()
+            if not action_lower.islower():
+                action_lower = action_lower.lower()
         else:
-            print(f"⚠️ [{self.name}] Unrecognized action: '{action}' - returning as-is")
+            action_lower = str(action).lower().strip()
+        canonical = _ACTION_MAP.get(action_lower)
+
+        # If we don't recognize it, log it and return as-is (lowercase)
+        if canonical is None:
+            _LOG.warning("⚠️ [%s] Unrecognized action: '%s' - returning as-is", self.name, action)
             return action_lower
+        return canonical
+
+    def _response_format(self) -> dict:
+        """Build the OpenAI response_format for this parser."""
+        if self.RESPONSE_SCHEMA is None:
+            return {"type": "json_object"}
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": "trade", "schema": self.RESPONSE_SCHEMA, "strict": True},
+        }
+
+    def _build_base_params(self, model: str) -> dict:
+        """Invariant request params for a model (everything except the messages)."""
+        params = {"model": model, "response_format": self._response_format()}
+        if not model.startswith(_NO_TEMPERATURE_MODELS):
+            params["temperature"] = 0
+        return params
+
+    def _params_for(self, model: str) -> dict:
+        """Prebuilt params for the cascade models; built on demand for any other model."""
+        params = self._base_params.get(model)
+        return params if params is not None else self._build_base_params(model)
+
+    def _request_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Chat messages for one request: the system prompt (if any), then the user prompt."""
+        system_prompt = self.build_system_prompt()
+        if system_prompt:
+            return [{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}]
+        return [{"role": "user", "content": prompt}]
 
     def _is_retryable_error(self, error: Exception) -> bool:
         """Check if an error is retryable (transient)."""
-        error_str = str(error).lower()
-        # Rate limits, timeouts, server errors
-        retryable_patterns = ['rate limit', '429', 'timeout', '500', '502', '503', '504', 'connection']
-        return any(pattern in error_str for pattern in retryable_patterns)
+        return _RETRYABLE_RE.search(str(error)) is not None
 
     def _call_openai_with_retry(self, model: str, prompt: str, logger, max_retries: int = 3) -> Tuple[Optional[str], float, Dict]:
         """
@@ -316,39 +712,30 @@ class BaseParser(ABC):
         """
         backoff_delays = [1, 2, 4]  # Exponential backoff: 1s, 2s, 4s
         total_latency = 0
-        token_info = {}
 
         for attempt in range(max_retries):
-            start_time = datetime.now(timezone.utc)
+            start_time = time.perf_counter()
             try:
-                params = {
-                    "model": model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "response_format": {"type": "json_object"},
-                    "temperature": 0
-                }
+                params = {**self._params_for(model), "messages": self._request_messages(prompt)}
 
-                response = self.client.chat.completions.create(**params)
+                if self.stream:
+                    params["stream"] = True
+                    params["stream_options"] = {"include_usage": True}
+                    content, usage = self._collect_stream(self.client.chat.completions.create(**params))
+                else:
+                    response = self.client.chat.completions.create(**params)
+                    content, usage = response.choices[0].message.content, getattr(response, 'usage', None)
 
-                end_time = datetime.now(timezone.utc)
-                latency = (end_time - start_time).total_seconds() * 1000
+                latency = (time.perf_counter() - start_time) * 1000
                 total_latency += latency
 
                 # Extract token usage from response
-                if hasattr(response, 'usage') and response.usage:
-                    token_info = {
-                        "prompt_tokens": response.usage.prompt_tokens,
-                        "completion_tokens": response.usage.completion_tokens,
-                        "total_tokens": response.usage.total_tokens,
-                        "model": model
-                    }
+                token_info = self._token_info(usage, model)
 
-                content = response.choices[0].message.content.strip()
-                return content, total_latency, token_info
+                return content.strip(), total_latency, token_info
 
             except Exception as e:
-                end_time = datetime.now(timezone.utc)
-                latency = (end_time - start_time).total_seconds() * 1000
+                latency = (time.perf_counter() - start_time) * 1000
                 total_latency += latency
 
                 if self._is_retryable_error(e) and attempt < max_retries - 1:
@@ -364,61 +751,279 @@ class BaseParser(ABC):
     def _call_openai(self, prompt: str, logger) -> Tuple[Optional[Union[Dict, List]], float]:
         """
         Makes the API call to OpenAI with fallback model strategy and retry logic.
-        Tries gpt-4o-mini first for speed, falls back to configured model on failure.
+        Tries the cheap model first for speed, falls back to the fallback model when
+        the response is empty, malformed, or fails validate_parsed_data.
         Includes exponential backoff retry for transient errors.
         """
-        # Model fallback order: try fast model first, then configured model
-        fast_model = "gpt-4o-mini"
-        fallback_model = self.model  # Configured model (usually gpt-4o)
-        models_to_try = [fast_model] if fast_model != fallback_model else [fallback_model]
-        if fast_model != fallback_model:
-            models_to_try.append(fallback_model)
+        cache_key = self._response_cache_key(prompt)
+        cached = self._cached_response(cache_key, logger)
+        if cached is not None:
+            return cached, 0.0
+
+        # Singleflight: an identical prompt already in flight (e.g. a duplicate
+        # alert parsed by another worker) is awaited instead of re-sent
+        with _INFLIGHT_LOCK:
+            pending = _INFLIGHT.get(cache_key)
+            leader = pending is None
+            if leader:
+                pending = _INFLIGHT[cache_key] = Future()
+        if not leader:
+            logger(f"⏳ [{self.name}] Identical request already in flight - waiting for its result")
+            parsed_json, latency = pending.result()
+            return copy.deepcopy(parsed_json), latency
+
+        try:
+            result = self._run_cascade(prompt, cache_key, logger)
+            # Followers get an untouched snapshot; the caller mutates its own copy
+            pending.set_result((copy.deepcopy(result[0]), result[1]))
+            return result
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with _INFLIGHT_LOCK:
+                _INFLIGHT.pop(cache_key, None)
+
+    def _run_cascade(self, prompt: str, cache_key: Tuple[str, str, str], logger) -> Tuple[Optional[Union[Dict, List]], float]:
+        """The cheap -> fallback model cascade behind _call_openai."""
+        models_to_try = self._cascade_models()
+        if self.hedge_after_ms is not None and len(models_to_try) > 1:
+            return self._run_hedged(prompt, cache_key, logger)
 
         total_latency = 0
         last_error = None
+        best_effort = None  # Cheap-model result that failed validation
+
+        for i, model in enumerate(models_to_try):
+            if i > 0:
+                self._cascade_stats["fallbacks"] += 1
+            parsed_json, accepted, latency, error, token_info = self._attempt(model, prompt, i == len(models_to_try) - 1, logger)
+            total_latency += latency
+            if accepted:
+                self._log_call_success(model, latency, token_info, parsed_json, logger)
+                self._store_response(cache_key, parsed_json)
+                return parsed_json, total_latency
+            if error is not None:
+                last_error = error
+            elif parsed_json is not None:
+                best_effort = parsed_json
 
-        for model in models_to_try:
-            try:
-                # Call with retry logic (returns content, latency, token_info)
-                content, latency, token_info = self._call_openai_with_retry(model, prompt, logger)
-                total_latency += latency
-
-                if not content:
-                    logger(f"⚠️ [{self.name}] Empty response from {model}, trying fallback...")
-                    continue
-
-                # Parse JSON
-                parsed_json = json.loads(content)
-
-                # Validate response has required structure
-                if not self._validate_response_structure(parsed_json):
-                    logger(f"⚠️ [{self.name}] Invalid response structure from {model}, trying fallback...")
-                    continue
-
-                # Success! Log with latency and token tracking
-                token_log = ""
-                if token_info:
-                    token_log = f" | Tokens: {token_info.get('prompt_tokens', 0)}→{token_info.get('completion_tokens', 0)} ({token_info.get('total_tokens', 0)} total)"
-                logger(f"✅ [{self.name}] OpenAI call successful with {model}. Latency: {latency:.2f} ms{token_log}")
+        return self._cascade_exhausted(best_effort, last_error, total_latency, logger)
 
-                # Log the raw parsed action for debugging
-                self._log_parsed_actions(parsed_json, logger)
+    def _run_hedged(self, prompt: str, cache_key: Tuple[str, str, str], logger) -> Tuple[Optional[Union[Dict, List]], float]:
+        """
+        Hedged cascade: start the cheap model; if it has no accepted answer within
+        hedge_after_ms (slow, invalid or failed), start the fallback model as well
+        and take whichever accepted answer arrives first. Only the returned answer is
+        logged as a success; starting the fallback model counts as a fallback, as in
+        the sequential cascade, whichever answer wins.
+        """
+        start = time.perf_counter()
+        cheap = _HEDGE_POOL.submit(self._attempt, self.cheap_model, prompt, False, logger)
+        done, _ = wait([cheap], timeout=self.hedge_after_ms / 1000)
 
-                return parsed_json, total_latency
+        last_error = None
+        best_effort = None
+        pending = {cheap}
+        if done:
+            parsed_json, accepted, latency, error, token_info = cheap.result()
+            if accepted:
+                self._log_call_success(self.cheap_model, latency, token_info, parsed_json, logger)
+                self._store_response(cache_key, parsed_json)
+                return parsed_json, (time.perf_counter() - start) * 1000
+            last_error = error
+            best_effort = parsed_json if error is None else None
+            pending = set()
+        else:
+            logger(f"⏱️ [{self.name}] {self.cheap_model} slower than {self.hedge_after_ms} ms, racing {self.fallback_model}")
+
+        self._cascade_stats["fallbacks"] += 1
+        fallback = _HEDGE_POOL.submit(self._attempt, self.fallback_model, prompt, True, logger)
+        pending.add(fallback)
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                parsed_json, accepted, latency, error, token_info = future.result()
+                if accepted:
+                    # A still-running loser finishes in the background and is ignored
+                    self._log_call_success(self.fallback_model if future is fallback else self.cheap_model,
+                                           latency, token_info, parsed_json, logger)
+                    self._store_response(cache_key, parsed_json)
+                    return parsed_json, (time.perf_counter() - start) * 1000
+                if error is not None:
+                    last_error = error
+                elif parsed_json is not None:
+                    best_effort = parsed_json
+
+        return self._cascade_exhausted(best_effort, last_error, (time.perf_counter() - start) * 1000, logger)
+
+    def _attempt(self, model: str, prompt: str, is_last: bool, logger) -> Tuple[Optional[Union[Dict, List]], bool, float, Optional[Exception], Dict]:
+        """
+        One model's try: (parsed_json, accepted, latency_ms, error, token_info).
+        Success is logged by the caller, which knows whether this answer is the one used.
+        """
+        try:
+            # Call with retry logic (returns content, latency, token_info)
+            content, latency, token_info = self._call_openai_with_retry(model, prompt, logger)
+        except Exception as e:
+            logger(f"⚠️ [{self.name}] API error from {model}: {e}")
+            return None, False, 0.0, e, {}
+        try:
+            parsed_json, accepted = self._check_response(model, content, is_last, logger)
+        except json.JSONDecodeError as e:
+            logger(f"⚠️ [{self.name}] JSON parse error from {model}: {e}")
+            return None, False, latency, e, token_info
+        except Exception as e:
+            logger(f"⚠️ [{self.name}] API error from {model}: {e}")
+            return None, False, latency, e, token_info
+        return parsed_json, accepted, latency, None, token_info
+
+    @staticmethod
+    def _collect_stream(stream) -> Tuple[str, object]:
+        """Accumulate a streamed completion into (content, usage); usage arrives on the final chunk."""
+        parts, usage = [], None
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            if chunk.usage:
+                usage = chunk.usage
+        return "".join(parts), usage
+
+    @staticmethod
+    def _token_info(usage, model: str) -> Dict:
+        """Token usage dict for logging, or {} when the response carried none."""
+        if not usage:
+            return {}
+        return {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+            "model": model
+        }
 
-            except json.JSONDecodeError as e:
-                last_error = e
-                logger(f"⚠️ [{self.name}] JSON parse error from {model}: {e}")
-                continue
-            except Exception as e:
-                last_error = e
-                logger(f"⚠️ [{self.name}] API error from {model}: {e}")
-                continue
+    def _response_cache_key(self, prompt: str) -> Tuple[str, str, str]:
+        """Key for _RESPONSE_CACHE: the cascade models plus a digest of the system and user prompts."""
+        hasher = hashlib.blake2b(prompt.encode(), digest_size=16)
+        system_prompt = self.build_system_prompt()
+        if system_prompt:
+            hasher.update(b"\0")
+            hasher.update(system_prompt.encode())
+        return (self.cheap_model, self.fallback_model, hasher.hexdigest())
+
+    def _cached_response(self, key: Tuple[str, str, str], logger) -> Optional[Union[Dict, List]]:
+        """Return a copy of a cached OpenAI response (callers mutate entries), or None."""
+        with _RESPONSE_CACHE_LOCK:
+            parsed_json = _RESPONSE_CACHE.get(key)
+            if parsed_json is None:
+                return None
+            _RESPONSE_CACHE.move_to_end(key)
+        logger(f"⚡ [{self.name}] Response cache hit - skipping OpenAI call")
+        return copy.deepcopy(parsed_json)
+
+    def _store_response(self, key: Tuple[str, str, str], parsed_json: Union[Dict, List]):
+        """Store an accepted OpenAI response, evicting the least recently used entry when full."""
+        with _RESPONSE_CACHE_LOCK:
+            _RESPONSE_CACHE[key] = copy.deepcopy(parsed_json)
+            _RESPONSE_CACHE.move_to_end(key)
+            if len(_RESPONSE_CACHE) > RESPONSE_CACHE_MAXSIZE:
+                _RESPONSE_CACHE.popitem(last=False)
+
+    def _cascade_models(self) -> List[str]:
+        """Models to try in order for one call; also counts the call for get_cascade_stats."""
+        self._cascade_stats["calls"] += 1
+        if self.fallback_model != self.cheap_model:
+            return [self.cheap_model, self.fallback_model]
+        return [self.cheap_model]
+
+    def _check_response(self, model: str, content: Optional[str], is_last: bool, logger) -> Tuple[Optional[Union[Dict, List]], bool]:
+        """
+        Decode and vet one model's response.
+        Returns (parsed_json, accepted); an unaccepted parsed_json is kept as best effort.
+        Raises json.JSONDecodeError (orjson's subclasses it) on malformed output.
+        """
+        if not content:
+            logger(f"⚠️ [{self.name}] Empty response from {model}, trying fallback...")
+            return None, False
+
+        parsed_json = self._unwrap_response(orjson.loads(content))
+        if self.RESPONSE_SCHEMA is not None:
+            parsed_json = self._drop_schema_nulls(parsed_json)
+
+        # Validate response has required structure
+        if not self._validate_response_structure(parsed_json):
+            logger(f"⚠️ [{self.name}] Invalid response structure from {model}, trying fallback...")
+            return None, False
+
+        # Escalate incomplete entries to the fallback model
+        if not is_last and not self._entries_valid(parsed_json, logger):
+            logger(f"⚠️ [{self.name}] Incomplete entries from {model}, trying fallback...")
+            return parsed_json, False
+
+        return parsed_json, True
+
+    def _log_call_success(self, model: str, latency: float, token_info: Dict, parsed_json, logger):
+        """Log a successful call with latency and token tracking."""
+        token_log = ""
+        if token_info:
+            token_log = f" | Tokens: {token_info.get('prompt_tokens', 0)}→{token_info.get('completion_tokens', 0)} ({token_info.get('total_tokens', 0)} total)"
+        logger(f"✅ [{self.name}] OpenAI call successful with {model}. Latency: {latency:.2f} ms{token_log}")
+
+        # Log the raw parsed action for debugging
+        self._log_parsed_actions(parsed_json)
+
+    def _cascade_exhausted(self, best_effort, last_error, total_latency: float, logger) -> Tuple[Optional[Union[Dict, List]], float]:
+        """Result when no model produced an accepted response."""
+        if best_effort is not None:
+            logger(f"⚠️ [{self.name}] Fallback failed, using incomplete result from {self.cheap_model}")
+            self._log_parsed_actions(best_effort)
+            return best_effort, total_latency
 
         # All models failed
         logger(f"❌ [{self.name}] All models failed. Last error: {last_error}")
         return None, total_latency
 
+    def _entries_valid(self, parsed_json, logger) -> bool:
+        """Check every parsed entry with validate_parsed_data (cascade trigger)."""
+        entries = parsed_json if isinstance(parsed_json, list) else [parsed_json]
+        for entry in entries:
+            if isinstance(entry, dict):
+                entry = {**entry, "action": self._standardize_action(entry.get("action"))}
+                if not self.validate_parsed_data(entry, logger):
+                    return False
+        return True
+
+    def get_cascade_stats(self) -> Dict[str, float]:
+        """Get model cascade statistics (how often the fallback model is started, hedged or not)."""
+        calls = self._cascade_stats["calls"]
+        fallbacks = self._cascade_stats["fallbacks"]
+        return {
+            "calls": calls,
+            "fallbacks": fallbacks,
+            "cascade_rate_pct": round(fallbacks / calls * 100, 1) if calls else 0,
+        }
+
+    def _unwrap_response(self, parsed_json):
+        """
+        JSON mode forces an object root, so prompts asking for an array come back
+        wrapped, e.g. {"trades": [...]}. Unwrap a lone list value into the array; an
+        empty one ({"trades": []}) means no trade, i.e. a null action, not a bad response.
+        """
+        if isinstance(parsed_json, dict) and 'action' not in parsed_json and len(parsed_json) == 1:
+            inner = next(iter(parsed_json.values()))
+            if isinstance(inner, list):
+                return inner or [{"action": "null"}]
+        return parsed_json
+
+    @staticmethod
+    def _drop_schema_nulls(parsed_json):
+        """Strict schemas fill every unused field with null; drop them so entries look like JSON-mode output."""
+        if isinstance(parsed_json, list):
+            return [{k: v for k, v in item.items() if v is not None} if isinstance(item, dict) else item
+                    for item in parsed_json]
+        if isinstance(parsed_json, dict):
+            return {k: v for k, v in parsed_json.items() if v is not None}
+        return parsed_json
+
     def _validate_response_structure(self, parsed_json) -> bool:
         """Validate that the response has the required structure."""
         if isinstance(parsed_json, dict):
@@ -429,18 +1034,14 @@ class BaseParser(ABC):
             return any(isinstance(item, dict) and 'action' in item for item in parsed_json)
         return False
 
-    def _log_parsed_actions(self, parsed_json, logger):
-        """Log the raw parsed actions for debugging."""
-        if isinstance(parsed_json, dict):
-            raw_action = parsed_json.get('action')
-            if raw_action:
-                logger(f"🔍 [{self.name}] Raw action from OpenAI: '{raw_action}'")
-        elif isinstance(parsed_json, list):
-            for item in parsed_json:
-                if isinstance(item, dict):
-                    raw_action = item.get('action')
-                    if raw_action:
-                        logger(f"🔍 [{self.name}] Raw action from OpenAI: '{raw_action}'")
+    def _log_parsed_actions(self, parsed_json):
+        """Log the raw parsed actions for debugging (only rendered when DEBUG is enabled)."""
+        if not _LOG.isEnabledFor(logging.DEBUG):
+            return
+        items = parsed_json if isinstance(parsed_json, list) else [parsed_json]
+        for item in items:
+            if isinstance(item, dict) and item.get('action'):
+                _LOG.debug("🔍 [%s] Raw action from OpenAI: '%s'", self.name, item['action'])
 
     def parse_message(self, message_meta, received_ts: datetime, logger, message_history: Optional[List[str]] = None) -> Tuple[List[Dict], float]:
         """
@@ -455,18 +1056,50 @@ class BaseParser(ABC):
         """
         # Check cache first for duplicate messages
         cache = get_parse_cache()
-        cached_result = cache.get(message_meta, message_history)
+        cache_key = cache.make_key(message_meta, message_history)
+        cached_result = cache.get(message_meta, key=cache_key)
         if cached_result is not None:
             cache_stats = cache.get_stats()
             logger(f"⚡ [{self.name}] CACHE HIT - returning cached result (hit rate: {cache_stats['hit_rate_pct']}%)")
             return cached_result
 
+        fast_result = self._fast_parse(cache_key, message_meta, message_history, received_ts, logger)
+        if fast_result is not None:
+            return fast_result
+
+        prompt = self._prepare_prompt(message_meta, message_history)
+        parsed_data, latency_ms = self._call_openai(prompt, logger)
+        return self._finalize_parse(cache_key, parsed_data, latency_ms, received_ts, logger)
+
+    def _try_fast_path(self, message_meta, logger) -> Optional[List[Dict]]:
+        """
+        Optional hook: return parsed entries (same shape as the LLM's JSON) for messages a
+        deterministic pattern fully covers, so the OpenAI call is skipped. None = use the LLM.
+        """
+        return None
+
+    def _fast_parse(self, cache_key: str, message_meta, message_history: Optional[List[str]], received_ts: datetime, logger) -> Optional[Tuple[List[Dict], float]]:
+        """Finalize _try_fast_path's entries like an LLM response, or None to fall through."""
+        start = time.perf_counter()
+        parsed_data = self._try_fast_path(message_meta, logger)
+        if parsed_data is None:
+            return None
         self._current_message_meta = message_meta
         self._message_history = message_history or []
-        prompt = self.build_prompt()
-        parsed_data, latency_ms = self._call_openai(prompt, logger)
+        logger(f"⚡ [{self.name}] Fast path matched - skipping OpenAI call")
+        return self._finalize_parse(cache_key, parsed_data, (time.perf_counter() - start) * 1000, received_ts, logger)
 
-        total_latency = (datetime.now(timezone.utc) - received_ts).total_seconds() * 1000
+    def _prepare_prompt(self, message_meta, message_history: Optional[List[str]]) -> str:
+        """Store the per-message state and build the prompt for it."""
+        self._current_message_meta = message_meta
+        self._message_history = message_history or []
+        return self.build_prompt()
+
+    def _finalize_parse(self, cache_key: str, parsed_data, latency_ms: float, received_ts: datetime, logger) -> Tuple[List[Dict], float]:
+        """Standardize, normalize and validate the OpenAI response, then cache it."""
+        cache = get_parse_cache()
+        now_dt = datetime.now(timezone.utc)  # One clock read for latency, metadata and date helpers
+        total_latency = (now_dt - received_ts).total_seconds() * 1000
         cache_stats = cache.get_stats()
         logger(f"⏱️ [{self.name}] Total processing latency: {total_latency:.2f} ms (OpenAI: {latency_ms:.2f} ms) | Cache: {cache_stats['hit_rate_pct']}% hit rate ({cache_stats['hits']}/{cache_stats['total']})")
 
@@ -477,7 +1110,7 @@ class BaseParser(ABC):
         results = parsed_data if isinstance(parsed_data, list) else [parsed_data]
 
         normalized_results = []
-        now = datetime.now(timezone.utc).isoformat()
+        now = now_dt.isoformat()
         
         for entry in results:
             if not isinstance(entry, dict):
@@ -508,19 +1141,20 @@ class BaseParser(ABC):
 
             # Allow subclasses to perform custom normalization
             # This happens AFTER action standardization
-            entry = self._normalize_entry(entry)
+            pre_action = entry['action']
+            entry = self._normalize_entry(entry, now=now_dt)
 
-            # Double-check action after subclass normalization
-            # (in case subclass changed it)
-            if 'action' in entry:
-                entry['action'] = self._standardize_action(entry.get('action'))
+            # Re-standardize only if the subclass changed the action
+            if 'action' in entry and entry['action'] != pre_action:
+                entry['action'] = self._standardize_action(entry['action'])
 
             # Validate against Pydantic schema (for logging/debugging, non-blocking)
             validated = validate_alert(entry, logger)
             if validated:
                 logger(f"✅ [{self.name}] Alert validated: {entry.get('action')} {entry.get('ticker', 'N/A')}")
                 # Use validated data (normalized fields like ticker uppercase)
-                entry.update(validated.model_dump(exclude_unset=True))
+                # Fields are flat scalars, so copy the set ones straight off the model (no serializer pass)
+                entry.update({k: getattr(validated, k) for k in validated.model_fields_set})
             else:
                 logger(f"⚠️ [{self.name}] Alert validation failed, using raw parsed data")
 
@@ -535,17 +1169,196 @@ class BaseParser(ABC):
 
         # Cache the result for future duplicate messages
         result = (normalized_results, latency_ms)
-        cache.set(message_meta, result, message_history)
+        cache.set(None, result, key=cache_key)
 
         return result
 
-    def get_weekly_expiry_date(self) -> str:
+    def _cached_for_today(self, build: Callable[[], str]) -> str:
+        """
+        Return build() memoized until the UTC date changes. For the static part of a
+        prompt: the rules and few-shot examples only vary with today's date.
+        """
+        today = datetime.now(timezone.utc).date()
+        cached = self._prompt_template
+        if cached is not None and cached[0] == today:
+            return cached[1]
+        text = build()
+        self._prompt_template = (today, text)
+        return text
+
+    def _render_system_prompt(self) -> str:
+        """SYSTEM_TEMPLATE with today's date slots filled in."""
+        today = datetime.now(timezone.utc)  # One clock read for every date in the prompt
+        current_year = today.year
+        return self.SYSTEM_TEMPLATE.format(
+            today_str=today_utc_str(today),
+            current_year=current_year,
+            next_year=current_year + 1,
+            weekly_exp=self.get_weekly_expiry_date(today),
+            next_week_exp=self.get_next_week_expiry_date(today),
+        )
+
+    def _build_user_prompt(self) -> str:
+        """
+        Per-message user prompt for SYSTEM_TEMPLATE parsers: open positions, the alert
+        ping flag, the primary message, then reply context and recent history if any.
+        """
+        # --- Determine message type and extract content ---
+        primary_message = ""
+        context_message = ""
+        if isinstance(self._current_message_meta, tuple):
+            primary_message = str(self._current_message_meta[0])
+            context_message = str(self._current_message_meta[1])
+        else:
+            primary_message = str(self._current_message_meta)
+
+        # --- Alert ping signal ---
+        has_alert_ping = self._ALERT_PING_TOKEN is not None and self._ALERT_PING_TOKEN in primary_message
+
+        # --- Position ledger injection ---
+        open_positions = self._get_open_positions_json()
+
+        # --- Message history with time deltas ---
+        history_text = self._format_history_with_deltas()
+
+        # --- Build the prompt (the rules go separately, see build_system_prompt) ---
+        parts = [_USER_TEMPLATE.format(
+            open_positions=open_positions,
+            alert_ping=str(has_alert_ping).lower(),
+            primary_message=primary_message,
+        )]
+
+        # --- Reply context ---
+        if context_message:
+            parts.append(f'\nREPLYING TO: "{context_message}"')
+
+        # --- Message history with time deltas ---
+        if history_text:
+            parts.append(f'''
+
+--- RECENT HISTORY (last {len(self._message_history)} messages, oldest first) ---
+{history_text}
+
+NOTE: Parse ONLY the PRIMARY message. History is context only.
+''')
+
+        return "".join(parts)
+
+    def _get_open_positions_json(self) -> str:
+        """
+        Query position ledger for open positions, return compact JSON for prompt.
+        Memoized on the ledger's write version, so unchanged positions skip the query.
+        """
+        if not self.position_ledger:
+            return "[]"
+        # Read the version before querying: a write landing mid-query just forces a refresh next time
+        version = getattr(self.position_ledger, "version", None)
+        memo = self._open_positions_memo
+        if version is not None and memo is not None and memo[0] == version:
+            return memo[1]
+        try:
+            positions = self.position_ledger.get_open_positions()
+            text = orjson.dumps([dict(zip(_POSITION_KEYS, _POSITION_FIELDS(p))) for p in positions]).decode()
+            if version is not None:
+                self._open_positions_memo = (version, text)
+            return text
+        except Exception:
+            return "[]"
+
+    def _normalize_size(self, entry: dict) -> None:
+        """Map a free-form size (e.g. "lotto", "1/5th size") onto full/half/small via SIZE_MAP."""
+        size = entry.get('size')
+        if size in self.CANONICAL_SIZES:
+            return
+        size = str(size if size is not None else '').lower().strip()
+        mapped = self.SIZE_MAP.get(size)  # covers legacy 'lotto' → 'small'
+        if mapped is None and size and size not in self.CANONICAL_SIZES:
+            # Substring match for compound formats like "1/5th size"
+            mapped = self._size_by_substring(size)
+        if mapped is not None:
+            entry['size'] = mapped
+
+    def _size_by_substring(self, size: str) -> Optional[str]:
+        """SIZE_MAP value of the first key (in dict order) found inside size, or None; memoized."""
+        memo_key = (id(self.SIZE_MAP), size)
+        try:
+            return _SIZE_SUBSTRING_MEMO[memo_key]
+        except KeyError:
+            pass
+        mapped = next((val for key, val in self.SIZE_MAP.items() if key in size), None)
+        if len(_SIZE_SUBSTRING_MEMO) < _SIZE_SUBSTRING_MEMO_MAX:
+            _SIZE_SUBSTRING_MEMO[memo_key] = mapped
+        return mapped
+
+    def _primary_message_lower(self) -> str:
+        """
+        The lowercased primary message (a reply's own text, not the original) for phrase
+        scans. Memoized on the message_meta object, so a message that yields several
+        entries is lowered once, not once per _normalize_entry call.
+        """
+        meta = self._current_message_meta
+        memo = self._primary_lower_memo
+        if memo is not None and memo[0] is meta:
+            return memo[1]
+        primary = meta[0] if isinstance(meta, tuple) else meta
+        lowered = str(primary).lower() if primary else ""
+        self._primary_lower_memo = (meta, lowered)
+        return lowered
+
+    def _format_history_with_deltas(self, now: Optional[datetime] = None) -> str:
+        """
+        Reformat message history from [HH:MM:SS] to [Xm ago] time deltas (relative to now).
+        The text is reused while the history is unchanged within the same 30s window, so a
+        burst of messages formats it once; labels may lag by up to 30 seconds.
+        """
+        if not self._message_history:
+            return ""
+        now = now or datetime.now(timezone.utc)
+        bucket = int(now.timestamp()) // 30
+        memo = self._history_memo
+        if memo is not None and memo[0] == bucket and memo[1] == self._message_history:
+            return memo[2]
+        # Whole seconds since UTC midnight; every line is plain int math against this
+        now_secs = now.hour * 3600 + now.minute * 60 + now.second
+        lines = []
+        for msg in self._message_history:
+            # Untimestamped lines pass straight through before any slicing
+            if not msg.startswith('['):
+                lines.append(msg)
+                continue
+            # Parse the fixed-width "[HH:MM:SS] " prefix (from get_channel_message_history) by slicing
+            hh, mm, ss = msg[1:3], msg[4:6], msg[7:9]
+            if (msg[3:4] == ':' and msg[6:7] == ':' and msg[9:10] == ']'
+                    and hh.isdecimal() and mm.isdecimal() and ss.isdecimal()
+                    and int(hh) < 24 and int(mm) < 60 and int(ss) < 60):
+                content = msg[10:].lstrip()
+                delta = now_secs - (int(hh) * 3600 + int(mm) * 60 + int(ss))
+                # A time later than now is from yesterday (crossed midnight)
+                if delta < 0:
+                    delta += 86400
+                total_minutes = delta // 60
+                if total_minutes < 1:
+                    tag = "just now"
+                elif total_minutes < 60:
+                    tag = f"{total_minutes}m ago"
+                else:
+                    hours = total_minutes // 60
+                    mins = total_minutes % 60
+                    tag = f"{hours}h{mins}m ago" if mins else f"{hours}h ago"
+                lines.append(f"[{tag}] {content}")
+            else:
+                lines.append(msg)
+        text = "\n".join(lines)
+        self._history_memo = (bucket, list(self._message_history), text)
+        return text
+
+    def get_weekly_expiry_date(self, now: Optional[datetime] = None) -> str:
         """
         Returns next Friday's date for 'weekly' keyword.
         - Mon-Thu: This Friday
         - Fri/Sat/Sun: Next Friday
         """
-        now = datetime.now(timezone.utc)
+        now = now or datetime.now(timezone.utc)
         weekday = now.weekday()  # 0=Mon, 4=Fri
         if weekday >= 4:  # Fri/Sat/Sun → Next Friday
             days_ahead = 7 - weekday + 4
@@ -554,11 +1367,11 @@ class BaseParser(ABC):
         target_date = now + timedelta(days=days_ahead)
         return target_date.strftime('%Y-%m-%d')
 
-    def get_next_week_expiry_date(self) -> str:
+    def get_next_week_expiry_date(self, now: Optional[datetime] = None) -> str:
         """
         Returns Friday after next for 'next week' keyword.
         """
-        now = datetime.now(timezone.utc)
+        now = now or datetime.now(timezone.utc)
         weekday = now.weekday()
         # First get to this Friday
         if weekday >= 4:
@@ -570,108 +1383,25 @@ class BaseParser(ABC):
         target_date = now + timedelta(days=days_ahead)
         return target_date.strftime('%Y-%m-%d')
 
-    def _smart_year_detection(self, date_str: str, logger) -> str:
+    def _smart_year_detection(self, date_str: str, logger, *, now: Optional[datetime] = None) -> str:
         """
         Convert MM-DD format dates to YYYY-MM-DD with intelligent year detection.
         If the date has already passed this year, assume it's for next year (LEAPS).
         Special handling for 0DTE (today's date).
+        `now` lets callers share one clock read across entries; defaults to the current UTC time.
         """
         if not date_str:
             return date_str
             
         # If already in YYYY-MM-DD format, return as-is
-        if re.match(r'\d{4}-\d{2}-\d{2}', date_str):
+        if _is_ymd(date_str) or _YMD_RE.match(date_str):
             return date_str
             
-        # Handle 0DTE case - return today's date
-        if date_str.lower() in ['0dte', 'today']:
-            return datetime.now(timezone.utc).strftime('%Y-%m-%d')
-            
-        # Try to parse various date formats
-        date_patterns = [
-            # Full date formats with year
-            (r'^(\d{1,2})/(\d{1,2})/(\d{4})$', 'MDY'),      # MM/DD/YYYY or M/D/YYYY
-            (r'^(\d{1,2})-(\d{1,2})-(\d{4})$', 'MDY'),      # MM-DD-YYYY or M-D-YYYY
-            (r'^(\d{4})-(\d{1,2})-(\d{1,2})$', 'YMD'),      # YYYY-MM-DD (already correct)
-            # Date formats without year  
-            (r'^(\d{1,2})-(\d{1,2})$', 'MD'),               # MM-DD or M-D
-            (r'^(\d{1,2})/(\d{1,2})$', 'MD'),               # MM/DD or M/D
-            # Month name formats
-            (r'^([A-Za-z]{3,})\s+(\d{1,2})\s+(\d{4})$', 'MonDY'),  # "January 16 2026"
-            (r'^([A-Za-z]{3,})\s+(\d{1,2})$', 'MonD'),             # "Jan 16"
-        ]
-        
-        for pattern_info in date_patterns:
-            pattern, format_type = pattern_info
-            match = re.match(pattern, date_str)
-            if match:
-                try:
-                    if format_type == 'YMD':
-                        # YYYY-MM-DD format - already correct
-                        year, month, day = int(match.group(1)), int(match.group(2)), int(match.group(3))
-                        return f"{year}-{month:02d}-{day:02d}"
-                    
-                    elif format_type == 'MDY':
-                        # MM/DD/YYYY or MM-DD-YYYY format
-                        month, day, year = int(match.group(1)), int(match.group(2)), int(match.group(3))
-                        target_date = datetime(year, month, day, tzinfo=timezone.utc)
-                        return target_date.strftime('%Y-%m-%d')
-                    
-                    elif format_type == 'MD':
-                        # MM/DD or MM-DD format (no year) - use smart year detection
-                        month, day = int(match.group(1)), int(match.group(2))
-                        
-                        # Get current date info
-                        now = datetime.now(timezone.utc)
-                        current_year = now.year
-                        
-                        # Try to create date for current year
-                        target_date = datetime(current_year, month, day, tzinfo=timezone.utc)
-                        
-                        # If the date has already passed this year, assume next year
-                        if target_date.date() < now.date():
-                            target_date = datetime(current_year + 1, month, day, tzinfo=timezone.utc)
-                            logger(f"🗓️ [{self.name}] Date {date_str} has passed in {current_year}, using {current_year + 1}")
-                        else:
-                            logger(f"🗓️ [{self.name}] Date {date_str} is future in {current_year}, using {current_year}")
-                            
-                        return target_date.strftime('%Y-%m-%d')
-                    
-                    elif format_type == 'MonDY':
-                        # "January 16 2026" format
-                        month_name, day, year = match.group(1), int(match.group(2)), int(match.group(3))
-                        month_num = datetime.strptime(month_name[:3], '%b').month
-                        target_date = datetime(year, month_num, day, tzinfo=timezone.utc)
-                        return target_date.strftime('%Y-%m-%d')
-                    
-                    elif format_type == 'MonD':
-                        # "Jan 16" format (no year) - use smart year detection
-                        month_name, day = match.group(1), int(match.group(2))
-                        month_num = datetime.strptime(month_name[:3], '%b').month
-                        
-                        # Get current date info
-                        now = datetime.now(timezone.utc)
-                        current_year = now.year
-                        
-                        # Try to create date for current year
-                        target_date = datetime(current_year, month_num, day, tzinfo=timezone.utc)
-                        
-                        # If the date has already passed this year, assume next year
-                        if target_date.date() < now.date():
-                            target_date = datetime(current_year + 1, month_num, day, tzinfo=timezone.utc)
-                            logger(f"🗓️ [{self.name}] Date {date_str} has passed in {current_year}, using {current_year + 1}")
-                        else:
-                            logger(f"🗓️ [{self.name}] Date {date_str} is future in {current_year}, using {current_year}")
-                            
-                        return target_date.strftime('%Y-%m-%d')
-                    
-                except ValueError:
-                    # Invalid date (e.g., Feb 30), return as-is
-                    logger(f"⚠️ [{self.name}] Invalid date format: {date_str}")
-                    return date_str
-        
-        # If no pattern matched, return as-is
-        return date_str
+        today = (now or datetime.now(timezone.utc)).date()
+        result, note = _resolve_date(date_str, today)
+        if note:
+            logger(f"{note[0]} [{self.name}] {note[1]}")
+        return result
 
     def _parse_monthly_expiration(self, expiration_str: str, logger) -> str:
         """
@@ -682,90 +1412,47 @@ class BaseParser(ABC):
             return expiration_str
             
         # Already in proper format
-        if re.match(r'\d{4}-\d{2}-\d{2}', expiration_str):
+        if _is_ymd(expiration_str) or _YMD_RE.match(expiration_str):
             return expiration_str
             
-        # Monthly expiration patterns
-        month_patterns = [
-            r'^(Jan|January|JAN)\s+(\d{4})$',
-            r'^(Feb|February|FEB)\s+(\d{4})$',
-            r'^(Mar|March|MAR)\s+(\d{4})$',
-            r'^(Apr|April|APR)\s+(\d{4})$',
-            r'^(May|MAY)\s+(\d{4})$',
-            r'^(Jun|June|JUN)\s+(\d{4})$',
-            r'^(Jul|July|JUL)\s+(\d{4})$',
-            r'^(Aug|August|AUG)\s+(\d{4})$',
-            r'^(Sep|September|SEP)\s+(\d{4})$',
-            r'^(Oct|October|OCT)\s+(\d{4})$',
-            r'^(Nov|November|NOV)\s+(\d{4})$',
-            r'^(Dec|December|DEC)\s+(\d{4})$'
-        ]
-        
-        month_map = {
-            'jan': 1, 'january': 1,
-            'feb': 2, 'february': 2,
-            'mar': 3, 'march': 3,
-            'apr': 4, 'april': 4,
-            'may': 5,
-            'jun': 6, 'june': 6,
-            'jul': 7, 'july': 7,
-            'aug': 8, 'august': 8,
-            'sep': 9, 'september': 9,
-            'oct': 10, 'october': 10,
-            'nov': 11, 'november': 11,
-            'dec': 12, 'december': 12
-        }
-        
-        # Check for monthly patterns
-        for pattern in month_patterns:
-            match = re.match(pattern, expiration_str.strip(), re.IGNORECASE)
-            if match:
-                month_str = match.group(1).lower()
-                year = int(match.group(2))
-                month = month_map.get(month_str)
-                
-                if month:
-                    # Calculate third Friday of the month
-                    import calendar
-                    cal = calendar.monthcalendar(year, month)
-                    fridays = [week[4] for week in cal if week[4] != 0]  # Friday is index 4
-                    
-                    if len(fridays) >= 3:
-                        third_friday = fridays[2]  # Third Friday (0-indexed)
-                        result = f"{year}-{month:02d}-{third_friday:02d}"
-                        logger(f"🗓️ [{self.name}] Monthly expiration parsed: '{expiration_str}' → '{result}'")
-                        return result
-                    else:
-                        logger(f"⚠️ [{self.name}] Could not calculate third Friday for {month_str} {year}")
+        # Check for monthly pattern
+        result = _resolve_monthly(expiration_str)
+        if result is not None:
+            logger(f"🗓️ [{self.name}] Monthly expiration parsed: '{expiration_str}' → '{result}'")
+            return result
         
         # Not a monthly expiration, return as-is for other date parsing
         return expiration_str
 
-    def _normalize_entry(self, entry: dict) -> dict:
+    def _normalize_entry(self, entry: dict, now: Optional[datetime] = None) -> dict:
         """
         Optional hook for subclasses to perform custom normalization.
         By default, it applies smart year detection to expiration dates as a FALLBACK.
         With the new LLM date parsing, expirations should already be in YYYY-MM-DD format.
-        Subclasses can override this to add channel-specific logic.
+        Subclasses can override this to add channel-specific logic; they should accept
+        `now` (the parse timestamp) and forward it to super().
         """
         # Apply expiration date parsing ONLY if not already in YYYY-MM-DD format
         if 'expiration' in entry and entry['expiration']:
             original_exp = str(entry['expiration']).strip()
 
             # Skip if already in YYYY-MM-DD format (LLM parsed correctly)
-            if re.match(r'^\d{4}-\d{2}-\d{2}$', original_exp):
-                print(f"✅ [{self.name}] Expiration already in YYYY-MM-DD format: {original_exp}")
+            if _is_ymd(original_exp):
+                _LOG.debug("✅ [%s] Expiration already in YYYY-MM-DD format: %s", self.name, original_exp)
                 return entry
 
             # FALLBACK: Parse dates that LLM didn't convert correctly
-            print(f"⚠️ [{self.name}] Expiration not in YYYY-MM-DD format, using fallback parsing: {original_exp}")
+            _LOG.info("⚠️ [%s] Expiration not in YYYY-MM-DD format, using fallback parsing: %s", self.name, original_exp)
 
-            # First try monthly expiration parsing (e.g., "JAN 2026")
-            parsed_exp = self._parse_monthly_expiration(original_exp, print)
+            # Fully dated formats first (e.g., "1/16/2026", "Jan 16 2026")
+            parsed_exp = _resolve_fast(original_exp)
+            if parsed_exp is None:
+                # Then monthly expiration parsing (e.g., "JAN 2026")
+                parsed_exp = self._parse_monthly_expiration(original_exp, _LOG.info)
 
-            # If not a monthly expiration, try regular date parsing
-            if parsed_exp == original_exp:
-                parsed_exp = self._smart_year_detection(original_exp, print)
+                # If not a monthly expiration, try regular date parsing
+                if parsed_exp == original_exp:
+                    parsed_exp = self._smart_year_detection(original_exp, _LOG.info, now=now)
 
             # Update if we successfully parsed it
             if parsed_exp != original_exp:
@@ -778,27 +1465,18 @@ class BaseParser(ABC):
         Validate that parsed data has minimum required fields based on action.
         This helps catch parsing issues early.
         """
-        action = entry.get('action', '').lower()
-        
+        action = str(entry.get('action') or '').lower()
+        required = _REQUIRED_FIELDS.get(action, ())
+        # Short-circuit on the common complete entry; only build the list to report a gap
+        if next((f for f in required if not entry.get(f)), None) is None:
+            return True
         if action == 'buy':
-            # Buy orders need ticker, strike, type, expiration, and price
-            required = ['ticker', 'strike', 'type', 'expiration', 'price']
             missing = [f for f in required if not entry.get(f)]
-            if missing:
-                logger(f"⚠️ [{self.name}] Buy order missing fields: {missing}")
-                return False
-                
-        elif action in ['trim', 'exit']:
+            logger(f"⚠️ [{self.name}] Buy order missing fields: {missing}")
+        else:
             # Trim/Exit need at least ticker (other fields can be looked up)
-            if not entry.get('ticker'):
-                logger(f"⚠️ [{self.name}] {action.title()} order missing ticker")
-                return False
-                
-        elif action == 'null':
-            # Null actions are valid (non-actionable messages)
-            return True
-            
-        return True
+            logger(f"⚠️ [{self.name}] {action.title()} order missing ticker")
+        return False
 
     def get_channel_info(self) -> dict:
         """
@@ -809,5 +1487,8 @@ class BaseParser(ABC):
             "name": self.name,
             "channel_id": self.channel_id,
             "model": self.model,
+            "cheap_model": self.cheap_model,
+            "fallback_model": self.fallback_model,
+            "cascade": self.get_cascade_stats(),
             "color": self.color
         }
\ No newline at end of file
@@ -1,14 +1,57 @@
 # channels/eva.py - Eva Channel Parser
 # Hybrid parser for Eva's Discord embed alerts
 # Open: Regex first, LLM fallback | Close: LLM with position ledger | Update: Check for STC only
-from .base_parser import BaseParser, get_parse_cache
+from .base_parser import BaseParser, get_parse_cache, today_utc_str, TRADE_SCHEMA
 from datetime import datetime, timezone
+from collections import OrderedDict
+from typing import Optional
+import functools
 import re
+import threading
 import time
-import json
+import orjson
+
+# Linear-time RE2 for the hot BTO/STC trade pattern when google-re2 is installed (optional)
+try:
+    import re2 as _hot_re
+except ImportError:
+    _hot_re = re
+
+
+# ─── Expiration: "01/09/26" or "08/26/2026" → month, day, year ───
+_DATE_PATTERN = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{2,4})")
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_eva_date(date_str: str) -> Optional[str]:
+    """Pure core of EvaParser._parse_date: YYYY-MM-DD, or None if date_str isn't MM/DD/YY[YY]."""
+    match = _DATE_PATTERN.fullmatch(date_str)
+    if not match:
+        return None
+
+    month, day, year = map(int, match.groups())
+
+    # Handle 2-digit year
+    if year < 100:
+        year += 2000
+
+    return "%04d-%02d-%02d" % (year, month, day)
+
+
+def _parse_strike(strike_str: str):
+    """Strike as int when whole ("694", "694.0"), float otherwise ("157.5")."""
+    strike = float(strike_str)
+    return int(strike) if strike.is_integer() else strike
+
+
+def _collapse_run(match) -> str:
+    """_CLEAN_RE replacement: whitespace collapses to one space, bare "**" is dropped."""
+    return " " if match.group().strip("*") else ""
 
 
 class EvaParser(BaseParser):
+    __slots__ = ("_close_actions", "_close_actions_lock", "_handlers")
+
     # ─── Embed Colors ───
     COLOR_OPEN = 65280       # green #00ff00
     COLOR_CLOSE = 16711680   # red #ff0000
@@ -17,61 +60,37 @@ class EvaParser(BaseParser):
     # ─── BTO/STC Regex: "BTO SPY 01/09/26 694c @ 0.53" ───
     # Groups: ticker, date (MM/DD/YY or MM/DD/YYYY), strike, type (c/p), price
     # Optional quantity prefix: "BTO 4 SPY..."
-    _TRADE_PATTERN = re.compile(
-        r"(?:BTO|STC)\s+(?:\d+\s+)?(\w+)\s+(\d{1,2}/\d{1,2}/\d{2,4})\s+(\d+(?:\.\d+)?)(c|p)\s*@\s*\$?([\d.]+)",
-        re.IGNORECASE,
+    # Written to behave identically under RE2 and re: case-insensitivity is inline (?i)
+    # (google-re2's module has no IGNORECASE flag) and the character classes are spelled
+    # out in ASCII, since RE2's \w/\d are ASCII-only while re's are Unicode. Whitespace is
+    # already collapsed to single spaces by _clean_description, so \s agrees too.
+    _TRADE_PATTERN = _hot_re.compile(
+        r"(?i)(?:BTO|STC)\s+(?:[0-9]+\s+)?([A-Za-z0-9_]+)\s+([0-9]{1,2}/[0-9]{1,2}/[0-9]{2,4})"
+        r"\s+([0-9]+(?:\.[0-9]+)?)(c|p)\s*@\s*\$?([0-9.]+)"
     )
 
     # ─── Detect STC in Update embeds ───
-    _STC_DETECT = re.compile(r"\bSTC\b", re.IGNORECASE)
+    # Plain re: a literal this short gains nothing from RE2, and \b differs for non-ASCII neighbours
+    _STC_DETECT = re.compile(r"\bstc\b")  # Run on the lowercased description
 
-    def __init__(self, openai_client, channel_id, config, **kwargs):
-        super().__init__(openai_client, channel_id, config, **kwargs)
-
-    def _get_open_positions_json(self) -> str:
-        """Query position ledger for open positions, return compact JSON for prompt."""
-        if not self.position_ledger:
-            return "[]"
-        try:
-            positions = self.position_ledger.get_open_positions()
-            pos_list = []
-            for p in positions:
-                pos_list.append({
-                    "ticker": p.ticker,
-                    "strike": p.strike,
-                    "type": p.option_type,
-                    "exp": p.expiration,
-                    "avg_cost": p.avg_cost_basis,
-                    "qty": p.total_quantity
-                })
-            return json.dumps(pos_list)
-        except Exception:
-            return "[]"
-
-    def build_prompt(self) -> str:
-        """Build LLM prompt for Close alerts and Open fallback."""
-        today = datetime.now(timezone.utc)
-        today_str = today.strftime('%Y-%m-%d')
-        current_year = today.year
-
-        # Get message content
-        primary_message = ""
-        if isinstance(self._current_message_meta, tuple):
-            primary_message = str(self._current_message_meta[1])  # description
-        else:
-            primary_message = str(self._current_message_meta)
+    # ─── Close-action keywords for the regex fallback (lowercased input), one alternation each ───
+    _TRIM_KEYWORDS_RE = re.compile(
+        r"leaving a runner|leave runners|leaving runners|holding|leave 1|leave one"
+        r"|exit some|exit most|exiting more|out some|out more|trim|scale out|scale some|profit"
+    )
+    _EXIT_KEYWORDS_RE = re.compile(
+        r"all out|out on remaining|stop loss hit|running stop loss|stopped out"
+    )
 
-        # Get open positions for context
-        open_positions = self._get_open_positions_json()
+    # ─── Description cleaning: bold markers and whitespace runs ───
+    _CLEAN_RE = re.compile(r"(?:\*\*|\s)+")
 
-        prompt = f"""You are a trade signal parser for Eva's options alerts.
+    # ─── Prompt: static rules as the system message (identical across calls, so OpenAI's
+    # prefix cache can reuse it), per-message context in the user message ───
+    _SYSTEM_PROMPT = """You are a trade signal parser for Eva's options alerts.
 Extract trade data and return a JSON object.
 
---- OPEN POSITIONS (for context) ---
-{open_positions}
-
 --- DATE RULES ---
-Today: {today_str}. Year: {current_year}.
 - Convert ALL dates to YYYY-MM-DD format
 - "01/09/26" → "2026-01-09"
 - "08/26/2026" → "2026-08-26"
@@ -112,49 +131,91 @@ For CLOSE (STC) alerts, determine TRIM vs EXIT:
 
 --- SHARES (not options) ---
 If no strike/type (e.g., "BTO NFLX @ 89.71 (adding shares)"):
-- Return {{"action": "null"}} - we only trade options
+- Return {"action": "null"} - we only trade options
 
 --- FEW-SHOT EXAMPLES ---
 
 **BUY (Open):**
 "BTO SPY 01/09/26 694c @ 0.53 (DAY TRADE/Possible Swing)"
-→ {{"action": "buy", "ticker": "SPY", "strike": 694, "type": "call", "expiration": "2026-01-09", "price": 0.53, "size": "full"}}
+→ {"action": "buy", "ticker": "SPY", "strike": 694, "type": "call", "expiration": "2026-01-09", "price": 0.53, "size": "full"}
 
 **EXIT (all out):**
 "STC SPY 01/12/26 695C @ 0.86 (all out)"
-→ {{"action": "exit", "ticker": "SPY", "strike": 695, "type": "call", "expiration": "2026-01-12", "price": 0.86}}
+→ {"action": "exit", "ticker": "SPY", "strike": 695, "type": "call", "expiration": "2026-01-12", "price": 0.86}
 
 **EXIT (stopped):**
 "STC SPY 01/09/26 694c @ 0.63 (running stop loss hit)"
-→ {{"action": "exit", "ticker": "SPY", "strike": 694, "type": "call", "expiration": "2026-01-09", "price": 0.63}}
+→ {"action": "exit", "ticker": "SPY", "strike": 694, "type": "call", "expiration": "2026-01-09", "price": 0.63}
 
 **TRIM (scale out):**
 "STC SPY 01/12/26 695C @ 1.01 (scale out some here)"
-→ {{"action": "trim", "ticker": "SPY", "strike": 695, "type": "call", "expiration": "2026-01-12", "price": 1.01}}
+→ {"action": "trim", "ticker": "SPY", "strike": 695, "type": "call", "expiration": "2026-01-12", "price": 1.01}
 
 **TRIM (leaving runner):**
 "STC SPY 01/15/26 700C @ 1.10 (leaving a runner if you want)"
-→ {{"action": "trim", "ticker": "SPY", "strike": 700, "type": "call", "expiration": "2026-01-15", "price": 1.10}}
+→ {"action": "trim", "ticker": "SPY", "strike": 700, "type": "call", "expiration": "2026-01-15", "price": 1.10}
 
 **TRIM (exit some - NOT full):**
 "STC AMZN 02/06/26 250C @ 1.63 (Exit most here as a day trade)"
-→ {{"action": "trim", "ticker": "AMZN", "strike": 250, "type": "call", "expiration": "2026-02-06", "price": 1.63}}
+→ {"action": "trim", "ticker": "AMZN", "strike": 250, "type": "call", "expiration": "2026-02-06", "price": 1.63}
 
 **NULL (shares):**
 "BTO NFLX @ 89.71 (adding shares into IRA)"
-→ {{"action": "null"}}
+→ {"action": "null"}
+"""
+
+    _USER_PROMPT_TEMPLATE = """--- OPEN POSITIONS (for context) ---
+{open_positions}
+
+--- TODAY ---
+Today: {today_str}. Year: {current_year}.
 
 --- MESSAGE TO PARSE ---
 "{primary_message}"
 """
-        return prompt
+
+    # ─── Structured outputs: LLM always returns a single trade object ───
+    RESPONSE_SCHEMA = TRADE_SCHEMA
+
+    # ─── Close phrasings remembered (LRU) so repeated wording skips the LLM ───
+    CLOSE_ACTION_CACHE_SIZE = 1024
+
+    def __init__(self, openai_client, channel_id, config, **kwargs):
+        super().__init__(openai_client, channel_id, config, **kwargs)
+        # Close phrasing (description minus the STC trade fields) → the LLM's trim/exit verdict
+        self._close_actions: "OrderedDict[str, str]" = OrderedDict()
+        self._close_actions_lock = threading.Lock()
+        # Embed title → handler(desc, logger)
+        self._handlers = {
+            "OPEN": self._parse_open,
+            "CLOSE": self._parse_close,
+            "UPDATE": self._parse_update,
+        }
+
+    def build_prompt(self) -> str:
+        """Build the per-message LLM prompt for Close alerts and Open fallback (rules go in _SYSTEM_PROMPT)."""
+        today = datetime.now(timezone.utc)
+
+        # Get message content
+        primary_message = ""
+        if isinstance(self._current_message_meta, tuple):
+            primary_message = str(self._current_message_meta[1])  # description
+        else:
+            primary_message = str(self._current_message_meta)
+
+        return self._USER_PROMPT_TEMPLATE.format(
+            open_positions=self._get_open_positions_json(),  # Open positions for context
+            today_str=today_utc_str(today),
+            current_year=today.year,
+            primary_message=primary_message,
+        )
 
     def parse_message(self, message_meta, received_ts, logger, message_history=None):
         """
         Hybrid parsing: Regex first for Open, LLM for Close.
         Eva's embeds arrive as message_meta = (embed_title, embed_description).
         """
-        start = time.monotonic()
+        start = time.perf_counter()
 
         # Eva's alerts are always embeds — reject plain text messages
         if not isinstance(message_meta, tuple) or len(message_meta) < 2:
@@ -162,10 +223,20 @@ If no strike/type (e.g., "BTO NFLX @ 89.71 (adding shares)"):
             return [], 0
 
         title, description = message_meta[0], message_meta[1]
+        title_clean = (title or "").strip().rstrip(":")  # Handle "Update:" colon
+        title_upper = title_clean.upper()
+        desc = self._clean_description(description or "")
 
-        # Cache check
+        # Open alerts: the regex is cheaper than hashing for the cache, so it goes first
+        if title_upper == "OPEN":
+            match = self._TRADE_PATTERN.search(desc)
+            if match:
+                return self._finish(self._open_from_match(match, logger), start, logger)
+
+        # Cache check (LLM paths only)
         cache = get_parse_cache()
-        cached = cache.get(message_meta, message_history)
+        cache_key = cache.make_key(message_meta, message_history)
+        cached = cache.get(message_meta, key=cache_key)
         if cached is not None:
             stats = cache.get_stats()
             logger(f"⚡ [Eva] CACHE HIT (hit rate: {stats['hit_rate_pct']}%)")
@@ -175,13 +246,16 @@ If no strike/type (e.g., "BTO NFLX @ 89.71 (adding shares)"):
         self._current_message_meta = message_meta
 
         # Dispatch based on embed title
-        title_clean = (title or "").strip().rstrip(":")  # Handle "Update:" colon
-        title_upper = title_clean.upper()
-        desc = self._clean_description(description or "")
-
         result = self._dispatch(title_upper, desc, logger)
+        out = self._finish(result, start, logger)
+
+        # Cache result
+        cache.set(message_meta, out, key=cache_key)
+        return out
 
-        latency_ms = (time.monotonic() - start) * 1000
+    def _finish(self, result, start, logger):
+        """Inject metadata, log, and return (results, latency_ms)."""
+        latency_ms = (time.perf_counter() - start) * 1000
 
         # Inject metadata into results
         now = datetime.now(timezone.utc).isoformat()
@@ -196,71 +270,103 @@ If no strike/type (e.g., "BTO NFLX @ 89.71 (adding shares)"):
         else:
             logger(f"ℹ️ [Eva] No actionable result ({latency_ms:.1f}ms)")
 
-        # Cache result
-        out = (result, latency_ms)
-        cache.set(message_meta, out, message_history)
-        return out
+        return result, latency_ms
 
     def _dispatch(self, title_upper, desc, logger):
         """Route to the correct parser based on embed title."""
-        if title_upper == "OPEN":
-            return self._parse_open(desc, logger)
-        elif title_upper == "CLOSE":
-            return self._parse_close_llm(desc, logger)
-        elif title_upper == "UPDATE":
-            # Check for hidden STC alerts in Update embeds
-            if self._STC_DETECT.search(desc):
-                logger(f"🔍 [Eva] Found STC in Update embed, parsing...")
-                return self._parse_close_llm(desc, logger)
-            return []  # Pure commentary
+        handler = self._handlers.get(title_upper)
+        if handler is not None:
+            return handler(desc, logger)
 
         logger(f"ℹ️ [Eva] Unrecognized embed title: '{title_upper}'")
         return []
 
+    def _parse_close(self, desc, logger):
+        """CLOSE embed: always a close, trim vs exit decided downstream."""
+        return self._parse_close_llm(desc, desc.lower(), logger)
+
+    def _parse_update(self, desc, logger):
+        """UPDATE embed: commentary unless it hides an STC alert."""
+        # Check for hidden STC alerts in Update embeds (lowercase once, reused downstream)
+        desc_lower = desc.lower()
+        if self._STC_DETECT.search(desc_lower):
+            logger(f"🔍 [Eva] Found STC in Update embed, parsing...")
+            return self._parse_close_llm(desc, desc_lower, logger)
+        return []  # Pure commentary
+
     def _parse_open(self, desc, logger):
         """Parse OPEN embed: Regex first, LLM fallback."""
         # Try regex first
         match = self._TRADE_PATTERN.search(desc)
         if match:
-            ticker = match.group(1).upper()
-            date_str = match.group(2)
-            strike_str = match.group(3)
-            opt_type = match.group(4).lower()
-            price = float(match.group(5))
-
-            # Handle decimal strikes (e.g., 157.5)
-            strike = float(strike_str) if '.' in strike_str else int(strike_str)
-
-            # Convert date from MM/DD/YY to YYYY-MM-DD
-            expiration = self._parse_date(date_str)
-
-            logger(f"🟢 [Eva] OPEN (regex): {ticker} {strike}{opt_type} {expiration} @ ${price:.2f}")
-
-            return [{
-                "action": "buy",
-                "ticker": ticker,
-                "strike": strike,
-                "type": "call" if opt_type == "c" else "put",
-                "expiration": expiration,
-                "price": price,
-                "size": "full",
-            }]
+            return self._open_from_match(match, logger)
 
         # Regex failed - use LLM fallback
         logger(f"⚠️ [Eva] OPEN regex failed, using LLM: {desc[:60]}...")
         return self._parse_with_llm(desc, logger, "OPEN")
 
-    def _parse_close_llm(self, desc, logger):
-        """Parse CLOSE embed using LLM for trim vs exit determination."""
-        logger(f"🔄 [Eva] CLOSE using LLM: {desc[:60]}...")
-        return self._parse_with_llm(desc, logger, "CLOSE")
+    def _open_from_match(self, match, logger):
+        """Build the buy entry from a _TRADE_PATTERN match."""
+        ticker = match.group(1).upper()
+        date_str = match.group(2)
+        opt_type = match.group(4).lower()
+        price = float(match.group(5))
+
+        # Handle decimal strikes (e.g., 157.5)
+        strike = _parse_strike(match.group(3))
+
+        # Convert date from MM/DD/YY to YYYY-MM-DD
+        expiration = self._parse_date(date_str)
+
+        logger(f"🟢 [Eva] OPEN (regex): {ticker} {strike}{opt_type} {expiration} @ ${price:.2f}")
+
+        return [{
+            "action": "buy",
+            "ticker": ticker,
+            "strike": strike,
+            "type": "call" if opt_type == "c" else "put",
+            "expiration": expiration,
+            "price": price,
+            "size": "full",
+        }]
+
+    def _parse_close_llm(self, desc, desc_lower, logger):
+        """
+        Parse CLOSE embed using LLM for trim vs exit determination.
+        Fields come straight from the regex, so when the same wording around them has
+        been classified before, its cached trim/exit verdict is reused without a call.
+        """
+        match = self._TRADE_PATTERN.search(desc_lower)
+        phrase = None
+        if match:
+            phrase = (desc_lower[:match.start()] + desc_lower[match.end():]).strip()
+            with self._close_actions_lock:
+                action = self._close_actions.get(phrase)
+                if action is not None:
+                    self._close_actions.move_to_end(phrase)
+            if action is not None:
+                entry = self._close_from_match(match, action)
+                emoji = "🔴" if action == "exit" else "🟡"
+                logger(f"{emoji} [Eva] CLOSE (cached phrasing): {action.upper()} {entry['ticker']}")
+                return [entry]
 
-    def _parse_with_llm(self, desc, logger, embed_type):
-        """Use LLM to parse message."""
+        logger(f"🔄 [Eva] CLOSE using LLM: {desc[:60]}...")
+        return self._parse_with_llm(desc, logger, "CLOSE", close_phrase=phrase, desc_lower=desc_lower)
+
+    def _remember_close_action(self, phrase: str, action: str):
+        """Record the LLM's verdict for a close phrasing, evicting the least recently used."""
+        with self._close_actions_lock:
+            self._close_actions[phrase] = action
+            self._close_actions.move_to_end(phrase)
+            if len(self._close_actions) > self.CLOSE_ACTION_CACHE_SIZE:
+                self._close_actions.popitem(last=False)
+
+    def _parse_with_llm(self, desc, logger, embed_type, close_phrase=None, desc_lower=None):
+        """Use LLM to parse message. close_phrase, if given, learns the LLM's trim/exit verdict."""
         if not self.client:
             logger(f"⚠️ [Eva] No OpenAI client, falling back to regex")
             if embed_type == "CLOSE":
-                return self._parse_close_regex_fallback(desc, logger)
+                return self._parse_close_regex_fallback(desc, logger, desc_lower)
             return []
 
         try:
@@ -268,13 +374,16 @@ If no strike/type (e.g., "BTO NFLX @ 89.71 (adding shares)"):
 
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                response_format={"type": "json_object"},
+                messages=[
+                    {"role": "system", "content": self._SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                response_format=self._response_format(),
                 temperature=0.1,
             )
 
             content = response.choices[0].message.content
-            result = json.loads(content)
+            result = orjson.loads(content)
 
             # Handle array or single object
             if isinstance(result, list):
@@ -285,6 +394,8 @@ If no strike/type (e.g., "BTO NFLX @ 89.71 (adding shares)"):
             # Filter null actions and normalize
             normalized = []
             for entry in results:
+                # Strict schema fills unused fields with null - drop them
+                entry = {k: v for k, v in entry.items() if v is not None}
                 if entry.get("action") in ("buy", "trim", "exit"):
                     # Normalize entry
                     entry = self._normalize_llm_entry(entry)
@@ -296,116 +407,90 @@ If no strike/type (e.g., "BTO NFLX @ 89.71 (adding shares)"):
                 emoji = "🟢" if action == "buy" else ("🔴" if action == "exit" else "🟡")
                 logger(f"{emoji} [Eva] {embed_type} (LLM): {action.upper()} {ticker}")
 
+            # Only a single, unambiguous close is safe to reuse by phrasing
+            if close_phrase is not None and len(normalized) == 1 and normalized[0]["action"] in ("trim", "exit"):
+                self._remember_close_action(close_phrase, normalized[0]["action"])
+
             return normalized
 
         except Exception as e:
             logger(f"❌ [Eva] LLM parse error: {e}")
             if embed_type == "CLOSE":
-                return self._parse_close_regex_fallback(desc, logger)
+                return self._parse_close_regex_fallback(desc, logger, desc_lower)
             return []
 
-    def _parse_close_regex_fallback(self, desc, logger):
+    def _parse_close_regex_fallback(self, desc, logger, desc_lower=None):
         """Regex fallback for Close when LLM fails."""
         match = self._TRADE_PATTERN.search(desc)
         if not match:
             logger(f"⚠️ [Eva] CLOSE regex fallback failed: {desc[:60]}")
             return []
 
-        ticker = match.group(1).upper()
-        date_str = match.group(2)
-        strike_str = match.group(3)
-        opt_type = match.group(4).lower()
-        price = float(match.group(5))
-
-        strike = float(strike_str) if '.' in strike_str else int(strike_str)
-        expiration = self._parse_date(date_str)
-
         # Simple keyword-based action determination
-        desc_lower = desc.lower()
-        action = self._determine_close_action(desc_lower)
+        action = self._determine_close_action(desc_lower if desc_lower is not None else desc.lower())
+        entry = self._close_from_match(match, action)
 
         emoji = "🔴" if action == "exit" else "🟡"
-        logger(f"{emoji} [Eva] CLOSE (regex fallback): {action.upper()} {ticker}")
+        logger(f"{emoji} [Eva] CLOSE (regex fallback): {action.upper()} {entry['ticker']}")
 
-        return [{
+        return [entry]
+
+    def _close_from_match(self, match, action: str) -> dict:
+        """Build a trim/exit entry from a _TRADE_PATTERN match."""
+        return {
             "action": action,
-            "ticker": ticker,
-            "strike": strike,
-            "type": "call" if opt_type == "c" else "put",
-            "expiration": expiration,
-            "price": price,
-        }]
+            "ticker": match.group(1).upper(),
+            "strike": _parse_strike(match.group(3)),
+            "type": "call" if match.group(4).lower() == "c" else "put",
+            "expiration": self._parse_date(match.group(2)),
+            "price": float(match.group(5)),
+        }
 
     def _determine_close_action(self, desc_lower: str) -> str:
         """Keyword-based trim vs exit for regex fallback."""
         # TRIM keywords (check first - higher priority)
-        trim_keywords = [
-            "leaving a runner", "leave runners", "leaving runners",
-            "holding", "leave 1", "leave one",
-            "exit some", "exit most", "exiting more",
-            "out some", "out more",
-            "trim", "scale out", "scale some",
-            "profit",
-        ]
-        for keyword in trim_keywords:
-            if keyword in desc_lower:
-                return "trim"
+        if self._TRIM_KEYWORDS_RE.search(desc_lower):
+            return "trim"
 
         # EXIT keywords
-        exit_keywords = [
-            "all out", "out on remaining",
-            "stop loss hit", "running stop loss", "stopped out",
-        ]
-        for keyword in exit_keywords:
-            if keyword in desc_lower:
-                return "exit"
+        if self._EXIT_KEYWORDS_RE.search(desc_lower):
+            return "exit"
 
         # Default to trim (safer)
         return "trim"
 
     def _normalize_llm_entry(self, entry: dict) -> dict:
         """Normalize LLM output."""
-        # Uppercase ticker
-        if entry.get("ticker"):
-            entry["ticker"] = entry["ticker"].upper().lstrip("$")
+        # Uppercase ticker (already canonical when the LLM followed the prompt)
+        ticker = entry.get("ticker")
+        if ticker and (not ticker.isupper() or ticker[0] == "$"):
+            entry["ticker"] = ticker.upper().lstrip("$")
 
         # Normalize option type
-        opt_type = entry.get("type", "").lower()
-        if opt_type in ("c", "call"):
-            entry["type"] = "call"
-        elif opt_type in ("p", "put"):
-            entry["type"] = "put"
+        opt_type = entry.get("type", "")
+        if opt_type not in ("call", "put"):
+            opt_type = opt_type.lower()
+            if opt_type in ("c", "call"):
+                entry["type"] = "call"
+            elif opt_type in ("p", "put"):
+                entry["type"] = "put"
 
         # Ensure price is numeric
         price = entry.get("price")
         if isinstance(price, str):
             try:
                 entry["price"] = float(price.replace("$", ""))
-            except:
+            except ValueError:
                 entry["price"] = "market"
 
         return entry
 
     def _parse_date(self, date_str: str) -> str:
-        """Convert MM/DD/YY or MM/DD/YYYY to YYYY-MM-DD format."""
-        parts = date_str.split("/")
-        if len(parts) != 3:
-            return datetime.now(timezone.utc).strftime("%Y-%m-%d")
-
-        month, day, year = parts
-        month = int(month)
-        day = int(day)
-        year = int(year)
-
-        # Handle 2-digit year
-        if year < 100:
-            year += 2000
-
-        return f"{year:04d}-{month:02d}-{day:02d}"
+        """Convert MM/DD/YY or MM/DD/YYYY to YYYY-MM-DD format (today's date if unparseable)."""
+        return _resolve_eva_date(date_str) or today_utc_str()
 
     @staticmethod
     def _clean_description(desc: str) -> str:
         """Strip formatting and normalize whitespace."""
-        desc = desc.replace("**", "")
-        desc = re.sub(r"\s+", " ", desc).strip()
-        return desc
+        # One pass: a run of whitespace and "**" becomes one space, or nothing if it has no whitespace
+        return EvaParser._CLEAN_RE.sub(_collapse_run, desc).strip()
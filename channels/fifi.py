@@ -1,111 +1,13 @@
 # channels/fifi.py - FiFi Channel Parser
 # Parses FiFi's (sauced2002) plain-English Discord trading alerts
-from .base_parser import BaseParser
-from datetime import datetime, timezone, timedelta
+from .base_parser import BaseParser, today_utc_str
+from datetime import datetime
+from typing import Optional, Tuple
 import re
-import json
 
 
-class FiFiParser(BaseParser):
-    FIFI_ALERT_ROLE_ID = "1369304547356311564"
-
-    # Embedded contract notation: e.g. "BMNR50p" -> ticker=BMNR, strike=50, type=put
-    EMBEDDED_CONTRACT_RE = re.compile(r'^([A-Z]+)(\d+(?:\.\d+)?)(c|p|call|put)$', re.IGNORECASE)
-
-    # Stop-out phrases that always mean exit
-    STOP_PHRASES = ["stopped out", "got stopped", "stop hit", "stopped on", "stops hit"]
-
-    # Size normalization mapping (full/half/small only)
-    SIZE_MAP = {
-        "lotto": "small", "tiny": "small", "1/8": "small", "super small": "small",
-        "lite": "small", "1/10": "small", "lottery": "small", "yolo": "small",
-        "half": "half", "some": "half", "starter": "half",
-        "1/4": "half", "couple cons": "half", "1/2": "half", "small size": "half",
-        "full": "full", "full size": "full",
-    }
-
-    def __init__(self, openai_client, channel_id, config, **kwargs):
-        super().__init__(openai_client, channel_id, config, **kwargs)
-
-    def _get_open_positions_json(self) -> str:
-        """Query position ledger for open positions, return compact JSON for prompt."""
-        if not self.position_ledger:
-            return "[]"
-        try:
-            positions = self.position_ledger.get_open_positions()
-            pos_list = []
-            for p in positions:
-                pos_list.append({
-                    "ticker": p.ticker,
-                    "strike": p.strike,
-                    "type": p.option_type,
-                    "exp": p.expiration,
-                    "avg_cost": p.avg_cost_basis,
-                    "qty": p.total_quantity
-                })
-            return json.dumps(pos_list)
-        except Exception:
-            return "[]"
-
-    def _format_history_with_deltas(self) -> str:
-        """Reformat message history from [HH:MM:SS] to [Xm ago] time deltas."""
-        if not self._message_history:
-            return ""
-        now = datetime.now(timezone.utc)
-        lines = []
-        for msg in self._message_history:
-            # Parse the [HH:MM:SS] timestamp from the history entry
-            ts_match = re.match(r'^\[(\d{2}):(\d{2}):(\d{2})\]\s*(.*)$', msg)
-            if ts_match:
-                h, m, s = int(ts_match.group(1)), int(ts_match.group(2)), int(ts_match.group(3))
-                content = ts_match.group(4)
-                # Build a UTC time for today with the extracted HH:MM:SS
-                msg_time = now.replace(hour=h, minute=m, second=s, microsecond=0)
-                # If the time is in the future (crossed midnight), subtract a day
-                if msg_time > now:
-                    msg_time -= timedelta(days=1)
-                delta = now - msg_time
-                total_minutes = int(delta.total_seconds() / 60)
-                if total_minutes < 1:
-                    tag = "just now"
-                elif total_minutes < 60:
-                    tag = f"{total_minutes}m ago"
-                else:
-                    hours = total_minutes // 60
-                    mins = total_minutes % 60
-                    tag = f"{hours}h{mins}m ago" if mins else f"{hours}h ago"
-                lines.append(f"[{tag}] {content}")
-            else:
-                lines.append(msg)
-        return "\n".join(lines)
-
-    def build_prompt(self) -> str:
-        today = datetime.now(timezone.utc)
-        current_year = today.year
-        today_str = today.strftime('%Y-%m-%d')
-        weekly_exp = self.get_weekly_expiry_date()
-        next_week_exp = self.get_next_week_expiry_date()
-
-        # --- Determine message type and extract content ---
-        primary_message = ""
-        context_message = ""
-        if isinstance(self._current_message_meta, tuple):
-            primary_message = str(self._current_message_meta[0])
-            context_message = str(self._current_message_meta[1])
-        else:
-            primary_message = str(self._current_message_meta)
-
-        # --- Enhancement 5: Role ping signal ---
-        has_alert_ping = f"<@&{self.FIFI_ALERT_ROLE_ID}>" in primary_message
-
-        # --- Enhancement 1: Position ledger injection ---
-        open_positions = self._get_open_positions_json()
-
-        # --- Enhancement 3: Message history with time deltas ---
-        history_text = self._format_history_with_deltas()
-
-        # --- Build the prompt ---
-        prompt = f"""You are a highly accurate data extraction assistant for option trading signals from a trader named FiFi.
+# FiFi's extraction rules and few-shot examples (rendered via BaseParser.SYSTEM_TEMPLATE)
+_SYSTEM_TEMPLATE = """You are a highly accurate data extraction assistant for option trading signals from a trader named FiFi.
 Your ONLY job is to extract EXECUTED trade actions and return a JSON array. Each distinct trade = one object.
 
 --- NEGATIVE CONSTRAINTS (HIGHEST PRIORITY — CHECK THESE FIRST) ---
@@ -136,13 +38,9 @@ Before classifying ANY message, check if it matches these patterns. If it does 
 
 7. TARGET PRICES: "TP 630", "TP: $A, $B, $C" are targets, NOT trims → "null".
 
---- OPEN POSITIONS ---
-{open_positions}
-
-Use this to resolve ambiguous trims/exits. If a ticker matches an open position, it's likely a valid trade action.
-
 --- CONTEXT ---
-ALERT PING: {str(has_alert_ping).lower()} (Pings = higher likelihood of actionable trade)
+OPEN POSITIONS: Use these to resolve ambiguous trims/exits. If a ticker matches an open position, it's likely a valid trade action.
+ALERT PING: Pings = higher likelihood of actionable trade.
 PRIMARY: The message to parse.
 REPLYING TO: Context for missing details (ticker, strike, expiration).
 
@@ -174,7 +72,7 @@ Today: {today_str}. Year: {current_year}.
 2. "0dte"/"today" → "{today_str}".
 3. "weekly"/"weeklies" → NEXT FRIDAY "{weekly_exp}" (NOT today's date).
 4. "next week"/"next weeks" → Friday after next "{next_week_exp}".
-5. Dates without year (e.g., "2/6", "Jan 17"): use {current_year} if future, {current_year + 1} if passed.
+5. Dates without year (e.g., "2/6", "Jan 17"): use {current_year} if future, {next_year} if passed.
 6. Monthly (e.g., "JAN 2026") → third Friday of that month.
 7. Buy with NO expiration → default "{today_str}".
 
@@ -258,57 +156,115 @@ REPLYING TO: "in MO 0dte $61c .08"
 **NULL (bare ticker):**
 "$FLNC"
 → [{{"action": "null"}}]
-
---- MESSAGE TO PARSE ---
-PRIMARY: "{primary_message}"
 """
-        # --- Enhancement 2: Reply context ---
-        if context_message:
-            prompt += f'\nREPLYING TO: "{context_message}"'
 
-        # --- Enhancement 3: Message history with time deltas ---
-        if history_text:
-            prompt += f'''
 
---- RECENT HISTORY (last {len(self._message_history)} messages, oldest first) ---
-{history_text}
+class FiFiParser(BaseParser):
+    __slots__ = ()
 
-NOTE: Parse ONLY the PRIMARY message. History is context only.
-'''
+    FIFI_ALERT_ROLE_ID = "1369304547356311564"
+    _ALERT_PING_TOKEN = f"<@&{FIFI_ALERT_ROLE_ID}>"
+    SYSTEM_TEMPLATE = _SYSTEM_TEMPLATE
 
-        return prompt
+    # Embedded contract notation: e.g. "BMNR50p" -> ticker=BMNR, strike=50, type=put
+    EMBEDDED_CONTRACT_RE = re.compile(r'^([A-Z]+)(\d+(?:\.\d+)?)(c|p|call|put)$', re.IGNORECASE)
+
+    # Explicit standalone entry, e.g. "in PLTR 2/6 $155p $2.70" (optionally with the alert ping).
+    # Anything beyond these tokens (size words, "weekly", a second trade) goes to the LLM.
+    FAST_BUY_RE = re.compile(
+        r'^(?:<@&\d+>\s*)?in\s+\$?(?P<ticker>[A-Z]{1,5})\s+(?P<exp>\d{1,2}/\d{1,2}|0dte)\s+'
+        r'\$?(?P<strike>\d+(?:\.\d+)?)(?P<type>[cp])\s+(?:@\s*)?\$?(?P<price>\d*\.?\d+)(?:\s*<@&\d+>)?$',
+        re.IGNORECASE,
+    )
+
+    # Stop-out phrases that always mean exit
+    STOP_PHRASES = ["stopped out", "got stopped", "stop hit", "stopped on", "stops hit"]
 
     # Averaging keywords that indicate adding to position (force half size)
     AVERAGING_KEYWORDS = ["added to", "scaling into", "back in", "add to", "scaling back", "added 5", "added 10"]
 
-    def _normalize_entry(self, entry: dict) -> dict:
+    # Every phrase class in one pass: the zero-width lookahead is tried at each position (so
+    # overlapping hits aren't swallowed) and the named group says which class fired there.
+    # No stop phrase starts like an averaging one, so one position never hides the other class.
+    _PHRASE_CLASS_RE = re.compile(
+        "(?=(?:(?P<stop>%s)|(?P<averaging>%s)))" % (
+            "|".join(map(re.escape, STOP_PHRASES)),
+            "|".join(map(re.escape, AVERAGING_KEYWORDS)),
+        )
+    )
+
+    # Size normalization mapping (full/half/small only)
+    SIZE_MAP = {
+        "lotto": "small", "tiny": "small", "1/8": "small", "super small": "small",
+        "lite": "small", "1/10": "small", "lottery": "small", "yolo": "small",
+        "half": "half", "some": "half", "starter": "half",
+        "1/4": "half", "couple cons": "half", "1/2": "half", "small size": "half",
+        "full": "full", "full size": "full",
+    }
+
+    def __init__(self, openai_client, channel_id, config, **kwargs):
+        super().__init__(openai_client, channel_id, config, **kwargs)
+
+    def _try_fast_path(self, message_meta, logger) -> Optional[list]:
+        """Parse a plain explicit entry with FAST_BUY_RE; replies and anything else use the LLM."""
+        if not isinstance(message_meta, str):
+            return None
+        m = self.FAST_BUY_RE.match(message_meta.strip())
+        if not m:
+            return None
+        strike = float(m.group('strike'))
+        return [{
+            "action": "buy",
+            "ticker": m.group('ticker').upper(),
+            "strike": int(strike) if strike.is_integer() else strike,
+            "type": "call" if m.group('type').lower() == 'c' else "put",
+            "expiration": self._smart_year_detection(m.group('exp'), logger),
+            "price": float(m.group('price')),
+            "size": "full",
+        }]
+
+    def build_prompt(self) -> str:
+        return self._build_user_prompt()
+
+    @classmethod
+    def _classify_phrases(cls, raw_msg: str) -> Tuple[bool, bool]:
+        """(is_averaging, is_stop) for a lowered message; one scan that stops once both classes are seen."""
+        is_averaging = is_stop = False
+        for m in cls._PHRASE_CLASS_RE.finditer(raw_msg):
+            if m.lastgroup == 'stop':
+                is_stop = True
+            else:
+                is_averaging = True
+            if is_stop and is_averaging:
+                break
+        return is_averaging, is_stop
+
+    def _normalize_entry(self, entry: dict, now: Optional[datetime] = None) -> dict:
         """FiFi-specific post-processing after base class date normalization."""
-        entry = super()._normalize_entry(entry)
+        entry = super()._normalize_entry(entry, now=now)
 
-        # --- Extract raw message for pattern matching ---
-        raw_msg = str(self._current_message_meta).lower() if self._current_message_meta else ""
-        if isinstance(self._current_message_meta, tuple):
-            raw_msg = str(self._current_message_meta[0]).lower()
+        # --- Phrase scans: only buy/trim can be changed by them, so exits and nulls skip the scan ---
+        action = entry.get('action')
+        if action not in ('exit', 'null'):
+            is_averaging, is_stop = self._classify_phrases(self._primary_message_lower())
 
-        # --- Averaging detection: force size to 'half' for adds ---
-        if entry.get('action') == 'buy':
-            if any(kw in raw_msg for kw in self.AVERAGING_KEYWORDS):
+            # --- Averaging detection: force size to 'half' for adds ---
+            if action == 'buy' and is_averaging:
                 current_size = (entry.get('size') or '').lower()
                 # Only override if not already explicitly smaller (small is smallest)
                 if current_size not in ['small', 'lotto', 'tiny', '1/8']:
                     entry['size'] = 'half'
 
-        # --- Stop-out phrase detection (force exit) ---
-        for phrase in self.STOP_PHRASES:
-            if phrase in raw_msg and entry.get('action') not in ('exit', 'null'):
+            # --- Stop-out phrase detection (force exit) ---
+            if is_stop:
                 entry['action'] = 'exit'
                 if not entry.get('price'):
                     entry['price'] = 'market'
-                break
 
         # --- Embedded contract notation: "BMNR50p" → ticker/strike/type ---
         ticker = entry.get('ticker', '')
-        if ticker and not entry.get('strike'):
+        # Plain letter tickers (nearly all of them) can't carry a strike: skip the regex
+        if ticker and not entry.get('strike') and not ticker.isalpha():
             m = self.EMBEDDED_CONTRACT_RE.match(ticker)
             if m:
                 entry['ticker'] = m.group(1).upper()
@@ -317,22 +273,11 @@ NOTE: Parse ONLY the PRIMARY message. History is context only.
                 entry['type'] = 'call' if t in ('c', 'call') else 'put'
 
         # --- Size normalization (full/half/small only) ---
-        size = str(entry.get('size', '')).lower().strip()
-        if size in self.SIZE_MAP:
-            entry['size'] = self.SIZE_MAP[size]
-        elif size == 'lotto':
-            entry['size'] = 'small'  # Normalize legacy 'lotto' to 'small'
-        elif size and size not in ('full', 'half', 'small'):
-            # Check for substring matches
-            for key, val in self.SIZE_MAP.items():
-                if key in size:
-                    entry['size'] = val
-                    break
+        self._normalize_size(entry)
 
         # --- Default 0DTE for buys without expiration ---
         if entry.get('action') == 'buy' and not entry.get('expiration'):
-            today = datetime.now(timezone.utc)
-            entry['expiration'] = today.strftime('%Y-%m-%d')
+            entry['expiration'] = today_utc_str(now)
 
         # --- Ticker cleanup ---
         if entry.get('ticker'):
@@ -1,105 +1,13 @@
 # channels/ian.py - Ian Channel Parser
 # Parses Ian's (ohiain) structured Discord trading alerts
-from .base_parser import BaseParser
-from datetime import datetime, timezone, timedelta
+from .base_parser import BaseParser, today_utc_str
+from datetime import datetime
+from typing import Optional
 import re
-import json
 
 
-class IanParser(BaseParser):
-    IAN_ALERT_ROLE_ID = "1457740469353058469"
-
-    # Size normalization mapping - Ian uses "X size" format (full/half/small only)
-    SIZE_MAP = {
-        "lotto": "small", "1/8": "small", "1/8th": "small", "tiny": "small",
-        "1/5": "small", "1/5th": "small", "1/10": "small", "lite": "small",
-        "half": "half", "1/2": "half", "1/4": "half", "1/4th": "half",
-        "1/3": "half", "1/3rd": "half", "some": "half", "starter": "half",
-        "full": "full", "full size": "full",
-    }
-
-    # Stop-out phrases that always mean exit
-    STOP_PHRASES = ["stopped out", "got stopped", "stop hit", "stopped on", "stops hit"]
-
-    def __init__(self, openai_client, channel_id, config, **kwargs):
-        super().__init__(openai_client, channel_id, config, **kwargs)
-
-    def _get_open_positions_json(self) -> str:
-        """Query position ledger for open positions, return compact JSON for prompt."""
-        if not self.position_ledger:
-            return "[]"
-        try:
-            positions = self.position_ledger.get_open_positions()
-            pos_list = []
-            for p in positions:
-                pos_list.append({
-                    "ticker": p.ticker,
-                    "strike": p.strike,
-                    "type": p.option_type,
-                    "exp": p.expiration,
-                    "avg_cost": p.avg_cost_basis,
-                    "qty": p.total_quantity
-                })
-            return json.dumps(pos_list)
-        except Exception:
-            return "[]"
-
-    def _format_history_with_deltas(self) -> str:
-        """Reformat message history from [HH:MM:SS] to [Xm ago] time deltas."""
-        if not self._message_history:
-            return ""
-        now = datetime.now(timezone.utc)
-        lines = []
-        for msg in self._message_history:
-            ts_match = re.match(r'^\[(\d{2}):(\d{2}):(\d{2})\]\s*(.*)$', msg)
-            if ts_match:
-                h, m, s = int(ts_match.group(1)), int(ts_match.group(2)), int(ts_match.group(3))
-                content = ts_match.group(4)
-                msg_time = now.replace(hour=h, minute=m, second=s, microsecond=0)
-                if msg_time > now:
-                    msg_time -= timedelta(days=1)
-                delta = now - msg_time
-                total_minutes = int(delta.total_seconds() / 60)
-                if total_minutes < 1:
-                    tag = "just now"
-                elif total_minutes < 60:
-                    tag = f"{total_minutes}m ago"
-                else:
-                    hours = total_minutes // 60
-                    mins = total_minutes % 60
-                    tag = f"{hours}h{mins}m ago" if mins else f"{hours}h ago"
-                lines.append(f"[{tag}] {content}")
-            else:
-                lines.append(msg)
-        return "\n".join(lines)
-
-    def build_prompt(self) -> str:
-        today = datetime.now(timezone.utc)
-        current_year = today.year
-        today_str = today.strftime('%Y-%m-%d')
-        weekly_exp = self.get_weekly_expiry_date()
-        next_week_exp = self.get_next_week_expiry_date()
-
-        # --- Determine message type and extract content ---
-        primary_message = ""
-        context_message = ""
-        if isinstance(self._current_message_meta, tuple):
-            primary_message = str(self._current_message_meta[0])
-            context_message = str(self._current_message_meta[1])
-        else:
-            primary_message = str(self._current_message_meta)
-
-        # --- Alert ping signal ---
-        has_alert_ping = f"<@&{self.IAN_ALERT_ROLE_ID}>" in primary_message
-
-        # --- Position ledger injection ---
-        open_positions = self._get_open_positions_json()
-
-        # --- Message history with time deltas ---
-        history_text = self._format_history_with_deltas()
-
-        # --- Build the prompt ---
-        prompt = f"""You are a highly accurate data extraction assistant for option trading signals from a trader named Ian (ohiain).
+# Rules for Ian's structured alert format, with few-shot examples (BaseParser.SYSTEM_TEMPLATE)
+_SYSTEM_TEMPLATE = """You are a highly accurate data extraction assistant for option trading signals from a trader named Ian (ohiain).
 Your ONLY job is to extract EXECUTED trade actions and return a JSON array. Each distinct trade = one object.
 
 --- NEGATIVE CONSTRAINTS (HIGHEST PRIORITY — CHECK THESE FIRST) ---
@@ -127,15 +35,8 @@ Before classifying ANY message, check if it matches these patterns. If it does 
 6. CONDITIONAL / FUTURE INTENT:
    "I will trim into", "I will look to", "might add", "plan to" → "null". Action must be DONE.
 
---- OPEN POSITIONS ---
-{open_positions}
-
-Use this to resolve ambiguous trims/exits. If a ticker matches an open position, use those contract details.
-
 --- CONTEXT ---
-ALERT PING: {str(has_alert_ping).lower()} (Pings = higher likelihood of actionable trade)
-PRIMARY: The message to parse.
-REPLYING TO: Context for missing details (ticker, strike, expiration).
+The user message carries OPEN POSITIONS (use them to resolve ambiguous trims/exits: if a ticker matches an open position, use those contract details), an ALERT PING flag (pings = higher likelihood of actionable trade), the PRIMARY message to parse and, for replies, REPLYING TO (context for missing ticker, strike, expiration).
 
 --- ACTION DEFINITIONS ---
 
@@ -284,29 +185,39 @@ $ASTS 120c 20 Feb (core position) 4/5th left +30% into close"
 **NULL (chart observation):**
 "$CIFR looks awesome, I love this RDR and DTL retest"
 → [{{"action": "null"}}]
-
---- MESSAGE TO PARSE ---
-PRIMARY: "{primary_message}"
 """
-        # --- Reply context ---
-        if context_message:
-            prompt += f'\nREPLYING TO: "{context_message}"'
 
-        # --- Message history with time deltas ---
-        if history_text:
-            prompt += f'''
 
---- RECENT HISTORY (last {len(self._message_history)} messages, oldest first) ---
-{history_text}
+class IanParser(BaseParser):
+    __slots__ = ()
 
-NOTE: Parse ONLY the PRIMARY message. History is context only.
-'''
+    IAN_ALERT_ROLE_ID = "1457740469353058469"
+    _ALERT_PING_TOKEN = f"<@&{IAN_ALERT_ROLE_ID}>"
+    SYSTEM_TEMPLATE = _SYSTEM_TEMPLATE
 
-        return prompt
+    # Size normalization mapping - Ian uses "X size" format (full/half/small only)
+    SIZE_MAP = {
+        "lotto": "small", "1/8": "small", "1/8th": "small", "tiny": "small",
+        "1/5": "small", "1/5th": "small", "1/10": "small", "lite": "small",
+        "half": "half", "1/2": "half", "1/4": "half", "1/4th": "half",
+        "1/3": "half", "1/3rd": "half", "some": "half", "starter": "half",
+        "full": "full", "full size": "full",
+    }
+
+    # Stop-out phrases that always mean exit
+    STOP_PHRASES = ["stopped out", "got stopped", "stop hit", "stopped on", "stops hit"]
+    # All stop phrases as one alternation: a single scan instead of one `in` per phrase
+    _STOP_PHRASE_RE = re.compile("|".join(map(re.escape, STOP_PHRASES)))
+
+    def __init__(self, openai_client, channel_id, config, **kwargs):
+        super().__init__(openai_client, channel_id, config, **kwargs)
 
-    def _normalize_entry(self, entry: dict) -> dict:
+    def build_prompt(self) -> str:
+        return self._build_user_prompt()
+
+    def _normalize_entry(self, entry: dict, now: Optional[datetime] = None) -> dict:
         """Ian-specific post-processing after base class date normalization."""
-        entry = super()._normalize_entry(entry)
+        entry = super()._normalize_entry(entry, now=now)
 
         # --- Stop updates ignored: return null action ---
         # BE stop is set automatically after first trim by the system
@@ -314,37 +225,19 @@ NOTE: Parse ONLY the PRIMARY message. History is context only.
             entry['action'] = 'null'
             return entry
 
-        # --- Extract raw message for pattern matching ---
-        raw_msg = str(self._current_message_meta).lower() if self._current_message_meta else ""
-        if isinstance(self._current_message_meta, tuple):
-            raw_msg = str(self._current_message_meta[0]).lower()
-
-        # --- Stop-out phrase detection (force exit) ---
-        for phrase in self.STOP_PHRASES:
-            if phrase in raw_msg and entry.get('action') not in ('exit', 'null'):
+        # --- Stop-out phrase detection (force exit); exits and nulls skip the scan ---
+        if entry.get('action') not in ('exit', 'null'):
+            if self._STOP_PHRASE_RE.search(self._primary_message_lower()):
                 entry['action'] = 'exit'
                 if not entry.get('price'):
                     entry['price'] = 'market'
-                break
 
         # --- Size normalization from "X size" format (full/half/small only) ---
-        size = str(entry.get('size', '')).lower().strip()
-        # Direct lookup
-        if size in self.SIZE_MAP:
-            entry['size'] = self.SIZE_MAP[size]
-        elif size == 'lotto':
-            entry['size'] = 'small'  # Normalize legacy 'lotto' to 'small'
-        elif size and size not in ('full', 'half', 'small'):
-            # Substring match for compound formats like "1/5th size"
-            for key, val in self.SIZE_MAP.items():
-                if key in size:
-                    entry['size'] = val
-                    break
+        self._normalize_size(entry)
 
         # --- Default 0DTE for buys without expiration ---
         if entry.get('action') == 'buy' and not entry.get('expiration'):
-            today = datetime.now(timezone.utc)
-            entry['expiration'] = today.strftime('%Y-%m-%d')
+            entry['expiration'] = today_utc_str(now)
 
         # --- Ticker cleanup ---
         if entry.get('ticker'):
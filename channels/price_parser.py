@@ -4,6 +4,8 @@ from .base_parser import BaseParser
 
 class PriceParser(BaseParser):
     """A utility parser to extract contract details from a free-form text query."""
+    __slots__ = ()
+
     def __init__(self, openai_client):
         # We don't need a real channel_id or full config for this utility parser
         config = {
@@ -71,7 +73,7 @@ If you cannot confidently extract all four key pieces of information (ticker, st
 Return only a single, valid JSON object. Do not include explanations or markdown formatting.
 """
 
-    def parse_message(self, message_meta, received_ts: datetime, logger):
+    def parse_message(self, message_meta, received_ts: datetime, logger, message_history=None):
         """
         Override BaseParser to handle utility parsing without action filtering.
         PriceParser doesn't need action fields - just contract details.
@@ -80,7 +82,8 @@ Return only a single, valid JSON object. Do not include explanations or markdown
         prompt = self.build_prompt()
         parsed_data, latency_ms = self._call_openai(prompt, logger)
 
-        total_latency = (datetime.now(timezone.utc) - received_ts).total_seconds() * 1000
+        now_dt = datetime.now(timezone.utc)
+        total_latency = (now_dt - received_ts).total_seconds() * 1000
         logger(f"⏱️ [{self.name}] Total processing latency: {total_latency:.2f} ms (OpenAI: {latency_ms:.2f} ms)")
 
         if parsed_data is None:
@@ -90,7 +93,7 @@ Return only a single, valid JSON object. Do not include explanations or markdown
         results = parsed_data if isinstance(parsed_data, list) else [parsed_data]
 
         normalized_results = []
-        now = datetime.now(timezone.utc).isoformat()
+        now = now_dt.isoformat()
         
         for entry in results:
             if not isinstance(entry, dict):
@@ -101,7 +104,7 @@ Return only a single, valid JSON object. Do not include explanations or markdown
             entry["received_ts"] = now
             
             # Apply date normalization
-            entry = self._normalize_entry(entry)
+            entry = self._normalize_entry(entry, now=now_dt)
             
             normalized_results.append(entry)
 
@@ -8,6 +8,8 @@ import time
 
 
 class RyanParser(BaseParser):
+    __slots__ = ()
+
     # ─── Embed Colors (for fallback dispatch when title is unrecognized) ───
     COLOR_ENTRY = 3066993      # green
     COLOR_TRIM = 16705372      # yellow
@@ -55,7 +57,8 @@ class RyanParser(BaseParser):
 
         # Cache check
         cache = get_parse_cache()
-        cached = cache.get(message_meta, message_history)
+        cache_key = cache.make_key(message_meta, message_history)
+        cached = cache.get(message_meta, key=cache_key)
         if cached is not None:
             stats = cache.get_stats()
             logger(f"⚡ [Ryan] CACHE HIT (hit rate: {stats['hit_rate_pct']}%)")
@@ -85,7 +88,7 @@ class RyanParser(BaseParser):
 
         # Cache result
         out = (result, latency_ms)
-        cache.set(message_meta, out, message_history)
+        cache.set(message_meta, out, key=cache_key)
         return out
 
     def _dispatch(self, title_upper, desc, color, logger):
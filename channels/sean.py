@@ -1,19 +1,17 @@
 # channels/sean.py
-from .base_parser import BaseParser
+from .base_parser import BaseParser, TRADES_SCHEMA, today_utc_str
 from datetime import datetime, timezone 
 
 class SeanParser(BaseParser):
+    __slots__ = ()
+
+    # Structured outputs enforce keys, types and enums, so the prompt skips those rules
+    RESPONSE_SCHEMA = TRADES_SCHEMA
+
     def __init__(self, openai_client, channel_id, config, **kwargs):
         super().__init__(openai_client, channel_id, config, **kwargs)
 
     def build_prompt(self) -> str:
-        # --- Dynamically get the current date ---
-        today = datetime.now(timezone.utc)
-        current_year = today.year
-        today_str = today.strftime('%Y-%m-%d')
-        weekly_exp = self.get_weekly_expiry_date()
-        next_week_exp = self.get_next_week_expiry_date()
-
         # --- Handle standard messages and replies ---
         primary_message = ""
         context_message = ""
@@ -25,10 +23,39 @@ class SeanParser(BaseParser):
             # It's a standard message
             primary_message = self._current_message_meta
 
-        # --- Construct the prompt ---
-        prompt = f"""
+        # --- Construct the prompt: static rules (rebuilt once a day) + the message ---
+        parts = [self._cached_for_today(self._build_static_prompt), f'PRIMARY MESSAGE: "{primary_message}"\n']
+        if context_message:
+            parts.append(f'\nORIGINAL MESSAGE (for context): "{context_message}"')
+
+        # Add recent conversation history if available
+        if self._message_history and len(self._message_history) > 0:
+            history_text = "\n".join(self._message_history)
+            parts.append(f'''
+
+--- RECENT CONVERSATION HISTORY (for additional context) ---
+The following are the last {len(self._message_history)} messages in chronological order (oldest first).
+Use this context to understand what positions may be active or what the trader has been discussing.
+
+{history_text}
+
+NOTE: The PRIMARY MESSAGE above is the one you need to parse. The history is only for context.
+''')
+
+        return "".join(parts)
+
+    def _build_static_prompt(self) -> str:
+        """Rules, date conversions and few-shot examples; depends only on today's date."""
+        # --- Dynamically get the current date ---
+        today = datetime.now(timezone.utc)
+        current_year = today.year
+        today_str = today_utc_str(today)
+        weekly_exp = self.get_weekly_expiry_date(today)
+        next_week_exp = self.get_next_week_expiry_date(today)
+
+        return f"""
 You are a highly accurate data extraction assistant for option trading signals from a trader named Sean.
-Your ONLY job is to extract the specified fields and return a single JSON object based on a strict set of rules.
+Your ONLY job is to extract the specified fields and return a JSON object {{"trades": [...]}} based on a strict set of rules.
 
 --- MESSAGE CONTEXT ---
 You will be given a PRIMARY message. If it is a reply to another message, you will also receive the ORIGINAL message for context.
@@ -61,14 +88,11 @@ You will be given a PRIMARY message. If it is a reply to another message, you wi
     - "Sep 19" → "{current_year}-09-19" (or {current_year + 1} if passed)
     - "JAN 2026" → "2026-01-17" (third Friday of January 2026)
 
---- OUTPUT FORMAT RULES ---
-1.  All JSON keys MUST be lowercase and snake_case (e.g., "option_type").
-2.  `ticker`: The stock symbol (e.g., "SPX"). Remove any "$" prefix.
-3.  `strike`: The strike price (number).
-4.  `type`: The option type ("call" or "put"). 'C' is "call", 'P' is "put".
-5.  `price`: The execution price (number). If "BE", return the string "BE".
-6.  `expiration`: MUST be in YYYY-MM-DD format (e.g., "2026-01-17").
-7.  `size`: The position size ("full", "half", or "small"). Default to "full" if not mentioned.
+--- OUTPUT FORMAT ---
+Return {{"trades": [...]}} with one object per trade, following the response schema; use null for fields not in the message.
+A non-actionable message is {{"trades": [{{"action": "null"}}]}}, never an empty list.
+All JSON keys MUST be lowercase and snake_case; `expiration` MUST be in YYYY-MM-DD format (e.g., "2026-01-17").
+`ticker` has no "$" prefix; 'C' is "call", 'P' is "put"; `price` is "BE" for breakeven; `size` defaults to "full".
 
 --- SIZE RULES ---
 - "full": Default size, no size keyword mentioned
@@ -78,18 +102,18 @@ You will be given a PRIMARY message. If it is a reply to another message, you wi
 Messages without an explicit trade directive (e.g. "all cash", "still holding", "watching", "flow on", "considering") must be labeled as: "action": "null"
 
 --- WEEKLY TRADE PLAN FILTERING ---
-**CRITICAL**: If the message contains weekly trade planning content, return {{"action": "null"}}. Detect these patterns:
+**CRITICAL**: If the message contains weekly trade planning content, return {{"trades": [{{"action": "null"}}]}}. Detect these patterns:
 - "Weekly Trade Plan", "Week Trade Plan", "Trading Plan for", "Weekly Plan", "Trade Plan:"
 - Messages discussing future trade setups without immediate execution prices
 - Planning messages that list multiple tickers with targets but no entry prices
-- Example: "9/8 Weekly Trade Plan: $DOCS - Taking 9/19 70C or 10/17 70C over 69.8 targeting 73.14" → {{"action": "null"}}
+- Example: "9/8 Weekly Trade Plan: $DOCS - Taking 9/19 70C or 10/17 70C over 69.8 targeting 73.14" → {{"trades": [{{"action": "null"}}]}}
 
 --- EXTRACTION LOGIC & RULES ---
 - If multiple tickers, return one object per ticker 
 - If info is missing, return as much as can be confidently extracted
 - Avoid inferring trades from general commentary or opinions
 - ENTRY: Represents a new trade. Must include Ticker, Strike, Option Type, and Entry Price.
-  - **PORTFOLIO UPDATE FILTER**: If message contains portfolio status, performance updates, or general commentary about positions, return {{"action": "null"}}.
+  - **PORTFOLIO UPDATE FILTER**: If message contains portfolio status, performance updates, or general commentary about positions, return {{"trades": [{{"action": "null"}}]}}.
 - TRIM: Represents a partial take-profit. Must include a price.
 - EXIT: Represents a full close of the position.
 - **Breakeven (BE)**: If the message mentions exiting at "BE", return "BE" as the value for the "price" field for immediate exits only.
@@ -110,80 +134,61 @@ NEVER use variations like "entry", "ENTRY", "BTO", etc. - ALWAYS use the exact v
 
 **BUY Example 1:**
 Message: "$SPY 580c 0dte @ 1.50"
-Output: {{"action": "buy", "ticker": "SPY", "strike": 580, "type": "call", "expiration": "{today_str}", "price": 1.50, "size": "full"}}
+Output: {{"trades": [{{"action": "buy", "ticker": "SPY", "strike": 580, "type": "call", "expiration": "{today_str}", "price": 1.50, "size": "full"}}]}}
 
 **BUY Example 2:**
 Message: "Opening SPX 6050P Jan 31 at 8.20 - half size"
-Output: {{"action": "buy", "ticker": "SPX", "strike": 6050, "type": "put", "expiration": "{current_year}-01-31", "price": 8.20, "size": "half"}}
+Output: {{"trades": [{{"action": "buy", "ticker": "SPX", "strike": 6050, "type": "put", "expiration": "{current_year}-01-31", "price": 8.20, "size": "half"}}]}}
 
 **BUY Example 3 (Small/Lotto):**
 Message: "Lotto play: TSLA 260c 1/17 @ 0.85"
-Output: {{"action": "buy", "ticker": "TSLA", "strike": 260, "type": "call", "expiration": "{current_year}-01-17", "price": 0.85, "size": "small"}}
+Output: {{"trades": [{{"action": "buy", "ticker": "TSLA", "strike": 260, "type": "call", "expiration": "{current_year}-01-17", "price": 0.85, "size": "small"}}]}}
 
 **TRIM Example 1:**
 Message: "Taking some off SPY at 2.30"
-Output: {{"action": "trim", "ticker": "SPY", "price": 2.30}}
+Output: {{"trades": [{{"action": "trim", "ticker": "SPY", "price": 2.30}}]}}
 
 **TRIM Example 2 (Reply Context):**
 PRIMARY: "Trimming half here at 3.50"
 ORIGINAL: "$NVDA 140c Jan 24 @ 2.00"
-Output: {{"action": "trim", "ticker": "NVDA", "strike": 140, "type": "call", "expiration": "{current_year}-01-24", "price": 3.50}}
+Output: {{"trades": [{{"action": "trim", "ticker": "NVDA", "strike": 140, "type": "call", "expiration": "{current_year}-01-24", "price": 3.50}}]}}
 
 **EXIT Example 1:**
 Message: "Out of SPX for 12.50"
-Output: {{"action": "exit", "ticker": "SPX", "price": 12.50}}
+Output: {{"trades": [{{"action": "exit", "ticker": "SPX", "price": 12.50}}]}}
 
 **EXIT Example 2 (Breakeven):**
 Message: "Closing AAPL at BE"
-Output: {{"action": "exit", "ticker": "AAPL", "price": "BE"}}
+Output: {{"trades": [{{"action": "exit", "ticker": "AAPL", "price": "BE"}}]}}
 
 **EXIT Example 3 (Reply with Stop):**
 PRIMARY: "Stopped out here at 0.40"
 ORIGINAL: "$AMD 145p Feb 7 @ 1.20"
-Output: {{"action": "exit", "ticker": "AMD", "strike": 145, "type": "put", "expiration": "{current_year}-02-07", "price": 0.40}}
+Output: {{"trades": [{{"action": "exit", "ticker": "AMD", "strike": 145, "type": "put", "expiration": "{current_year}-02-07", "price": 0.40}}]}}
 
 **EXIT Example 4 (Stop without price / typo):**
 Message: "Stoppedo ut $CRML @everyone"
-Output: {{"action": "exit", "ticker": "CRML", "price": "market"}}
+Output: {{"trades": [{{"action": "exit", "ticker": "CRML", "price": "market"}}]}}
 
 **EXIT Example 5 (Stop without price):**
 Message: "Stopped out of TSLA"
-Output: {{"action": "exit", "ticker": "TSLA", "price": "market"}}
+Output: {{"trades": [{{"action": "exit", "ticker": "TSLA", "price": "market"}}]}}
 
 **EXIT Example 6 (Multiple tickers, no price):**
 Message: "Closing $RKLB and $USAR rolls in deep profits"
-Output: [{{"action": "exit", "ticker": "RKLB", "price": "market"}}, {{"action": "exit", "ticker": "USAR", "price": "market"}}]
+Output: {{"trades": [{{"action": "exit", "ticker": "RKLB", "price": "market"}}, {{"action": "exit", "ticker": "USAR", "price": "market"}}]}}
 
 **COMMENTARY Example 1:**
 Message: "Watching GOOGL for a potential entry"
-Output: {{"action": "null"}}
+Output: {{"trades": [{{"action": "null"}}]}}
 
 **COMMENTARY Example 2:**
 Message: "Still holding my SPY position, looking good"
-Output: {{"action": "null"}}
+Output: {{"trades": [{{"action": "null"}}]}}
 
 **COMMENTARY Example 3 (Weekly Plan):**
 Message: "Weekly Trade Plan: Looking at MSFT 420c and META 550c for next week"
-Output: {{"action": "null"}}
+Output: {{"trades": [{{"action": "null"}}]}}
 
 --- MESSAGE TO PARSE ---
-PRIMARY MESSAGE: "{primary_message}"
 """
-        if context_message:
-            prompt += f'\nORIGINAL MESSAGE (for context): "{context_message}"'
-
-        # Add recent conversation history if available
-        if self._message_history and len(self._message_history) > 0:
-            history_text = "\n".join(self._message_history)
-            prompt += f'''
-
---- RECENT CONVERSATION HISTORY (for additional context) ---
-The following are the last {len(self._message_history)} messages in chronological order (oldest first).
-Use this context to understand what positions may be active or what the trader has been discussing.
-
-{history_text}
-
-NOTE: The PRIMARY MESSAGE above is the one you need to parse. The history is only for context.
-'''
-
-        return prompt
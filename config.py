@@ -129,6 +129,7 @@ CHANNELS_CONFIG = {
         "buy_padding": 0.025,  # 2.5% padding
         "sell_padding": 0.01,  # 2.5% padding
         "model": "gpt-4o-2024-08-06",
+        "cheap_model": "gpt-4o-mini",  # Tried first; "model" is the fallback on invalid output
         "color": 3066993,  # Green
         "description": "Sean's technical analysis based trades",
         "risk_level": "medium-high",
@@ -147,6 +148,7 @@ CHANNELS_CONFIG = {
         "buy_padding": 0.025,
         "sell_padding": 0.01,
         "model": "gpt-4o-2024-08-06",
+        "cheap_model": "gpt-4o-mini",  # Tried first; "model" is the fallback on invalid output
         "color": 15277667,             # Pink (0xE91E63)
         "description": "FiFi's swing and momentum trades",
         "risk_level": "medium",
@@ -184,6 +186,7 @@ CHANNELS_CONFIG = {
         "buy_padding": 0.025,
         "sell_padding": 0.01,
         "model": "gpt-4o-2024-08-06",
+        "cheap_model": "gpt-4o-mini",  # Tried first; "model" is the fallback on invalid output
         "color": 3447003,                # Blue (0x3498DB)
         "description": "Ian's structured swing trades with stop management",
         "risk_level": "medium",
@@ -30,6 +30,7 @@ Configuration (config.py):
     - LEDGER_LOCK_TIMEOUT: Lock timeout for pending exits
 """
 
+import itertools
 import sqlite3
 import logging
 import random
@@ -124,6 +125,10 @@ class PositionLedger:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.lock = Lock()  # Thread safety for concurrent access
+        # Bumped after every commit that changed rows; readers key caches on it.
+        # next() on itertools.count is atomic, so concurrent writers never reuse a value.
+        self._version_counter = itertools.count(1)
+        self.version = 0
         self._init_db()
         self._verify_database_integrity()
         logger.info(f"Position ledger initialized at {self.db_path}")
@@ -138,6 +143,8 @@ class PositionLedger:
         try:
             yield conn
             conn.commit()
+            if conn.total_changes:
+                self.version = next(self._version_counter)
         except Exception as e:
             conn.rollback()
             raise e
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Offline eval for FiFi's prompt examples: runs every case below through FiFiParser once
+per examples variant ("full" = the live FEW-SHOT EXAMPLES block, "compact" = one line per
+category) and prints a side-by-side pass/fail table. Run it before trimming the live
+examples; only cut them if "compact" scores the same as "full".
+
+    python tsc_analysis/fifi_prompt_eval.py            # both variants
+    python tsc_analysis/fifi_prompt_eval.py compact    # just one
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime, timezone
+from openai import OpenAI
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from channels.base_parser import _resolve_date, get_parse_cache, today_utc_str
+from channels.fifi import FiFiParser
+
+# Candidate replacement for the live FEW-SHOT EXAMPLES block (braces doubled for .format)
+COMPACT_EXAMPLES = '''--- EXAMPLES (one per category; message → output) ---
+BUY:   "in MO 0dte $61c .08 LOTTO SIZE" → [{{"action": "buy", "ticker": "MO", "strike": 61, "type": "call", "expiration": "{today_str}", "price": 0.08, "size": "small"}}]
+MULTI: "in MU weekly $250p 1/8 size $2.80\\nin next weeks 250p 1/2 size $6" → [{{"action": "buy", "ticker": "MU", "strike": 250, "type": "put", "expiration": "{weekly_exp}", "price": 2.80, "size": "small"}}, {{"action": "buy", "ticker": "MU", "strike": 250, "type": "put", "expiration": "{next_week_exp}", "price": 6.0, "size": "half"}}]
+TRIM:  PRIMARY "trim .18" REPLYING TO "in MO 0dte $61c .08" → [{{"action": "trim", "ticker": "MO", "strike": 61, "type": "call", "price": 0.18}}]
+EXIT:  "got stopped on rest of RGTI" → [{{"action": "exit", "ticker": "RGTI", "price": "market"}}]
+NULL:  "Trims PLTR $2.70 to $4.00" | "Have a limit sell for 1/2" | "Pullback to $210\\nTP: $220" | "82c" | "$FLNC" → [{{"action": "null"}}]
+'''
+
+# (message_meta, expected parse_message result). Expected fields are checked only where
+# given. Null actions are dropped by _finalize_parse, so non-trades expect [].
+# "{today}", "{weekly}", "{next_week}" are filled in at run time; "md:M/D" resolves a
+# yearless date with the parser's own rule (_resolve_date rolls past dates to next year).
+CASES = [
+    # BUY ("puts" keeps it off FAST_BUY_RE, so the prompt is what's tested)
+    ("in PLTR 2/6 $155 puts $2.70",
+     [{"action": "buy", "ticker": "PLTR", "strike": 155, "type": "put", "expiration": "md:2/6", "price": 2.70, "size": "full"}]),
+    ("TSLA 480p 0dte 1.40",
+     [{"action": "buy", "ticker": "TSLA", "strike": 480, "type": "put", "expiration": "{today}", "price": 1.40, "size": "full"}]),
+    ("in MO 0dte $61c .08 LOTTO SIZE",
+     [{"action": "buy", "ticker": "MO", "strike": 61, "type": "call", "expiration": "{today}", "price": 0.08, "size": "small"}]),
+    # MULTI-BUY
+    ("in MU weekly $250p 1/8 size $2.80\nin next weeks 250p 1/2 size $6",
+     [{"action": "buy", "ticker": "MU", "strike": 250, "type": "put", "expiration": "{weekly}", "price": 2.80, "size": "small"},
+      {"action": "buy", "ticker": "MU", "strike": 250, "type": "put", "expiration": "{next_week}", "price": 6.0, "size": "half"}]),
+    ("Added to April puts\nSPY $670 @ $9.50\nQQQ $600p @ 11.60",
+     [{"action": "buy", "ticker": "SPY", "strike": 670, "type": "put", "price": 9.50},
+      {"action": "buy", "ticker": "QQQ", "strike": 600, "type": "put", "price": 11.60}]),
+    # TRIM
+    (("trim .18", "in MO 0dte $61c .08"),
+     [{"action": "trim", "ticker": "MO", "strike": 61, "type": "call", "price": 0.18}]),
+    ("asold another UPS con here $4.50 from $2",
+     [{"action": "trim", "ticker": "UPS", "price": 4.50}]),
+    # EXIT
+    ("out TSLA 1.4",
+     [{"action": "exit", "ticker": "TSLA", "price": 1.40}]),
+    ("got stopped on rest of RGTI",
+     [{"action": "exit", "ticker": "RGTI", "price": "market"}]),
+    ("all out weekly SPY 8.60",
+     [{"action": "exit", "ticker": "SPY", "price": 8.60}]),
+    # NULL
+    ("Trims 💇‍♀️ PLTR $2.70 to $4.00 XOM $4.05 to $7.50", []),
+    ("Heading into meetings. Have a limit sell for 1/2", []),
+    ("KEYS\nPullback to $210 or Over $214.50\n2/20 $230c\nTP: $220, $230, $240", []),
+    ("$NVDA 🩸\nRejection of $185 or Below $180\n2/20 $175p\nTP: $176, $172, $165", []),
+    ("82c", []),
+    ("$FLNC", []),
+]
+
+# The live template up to its examples; each variant appends its own examples block
+_LIVE_TEMPLATE = FiFiParser.SYSTEM_TEMPLATE
+_TEMPLATE_HEAD = _LIVE_TEMPLATE[:_LIVE_TEMPLATE.index("--- FEW-SHOT EXAMPLES ---")]
+VARIANTS = {
+    "full": _LIVE_TEMPLATE,
+    "compact": _TEMPLATE_HEAD + COMPACT_EXAMPLES,
+}
+
+
+def _expected_value(value, dates):
+    """Fill run-time placeholders in an expected field value."""
+    if not isinstance(value, str):
+        return value
+    if value.startswith("md:"):
+        return _resolve_date(value[3:], dates["today_date"])[0]
+    return value.format(**dates)
+
+
+def _matches(expected, actual, dates):
+    """True if every expected field appears with the same value in actual."""
+    if len(expected) != len(actual):
+        return False
+    for exp, got in zip(expected, actual):
+        for key, value in exp.items():
+            if got.get(key) != _expected_value(value, dates):
+                return False
+    return True
+
+
+def run_variant(client, name, dates):
+    """Run every case with one examples variant; returns a list of pass/fail booleans."""
+    variant_class = type(f"FiFiParser_{name}", (FiFiParser,), {"SYSTEM_TEMPLATE": VARIANTS[name]})
+    # The parse cache is keyed by message only, so clear it or this variant would
+    # be answered from the previous variant's results
+    get_parse_cache().clear()
+    parser = variant_class(client, 1368713891072315483, {
+        "name": "FiFi",
+        "model": "gpt-4o-mini",
+        "color": 15277667
+    })
+
+    outcomes = []
+    for message_meta, expected in CASES:
+        # Cases answered by the regex fast path wouldn't exercise the prompt at all
+        assert parser._try_fast_path(message_meta, lambda _: None) is None, message_meta
+        actual, latency_ms = parser.parse_message(message_meta, datetime.now(timezone.utc), lambda _: None)
+        ok = _matches(expected, actual, dates)
+        outcomes.append(ok)
+        if not ok:
+            print(f"[{name}] FAIL ({latency_ms:.0f}ms) {message_meta!r}")
+            print(f"    expected: {expected}")
+            print(f"    actual:   {actual}")
+    return outcomes
+
+
+def run_eval(variant_names):
+    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    probe = FiFiParser(None, 0, {"name": "FiFi"})
+    now = datetime.now(timezone.utc)
+    dates = {
+        "today": today_utc_str(now),
+        "today_date": now.date(),
+        "weekly": probe.get_weekly_expiry_date(now),
+        "next_week": probe.get_next_week_expiry_date(now),
+    }
+
+    results = {name: run_variant(client, name, dates) for name in variant_names}
+
+    print()
+    print("case".ljust(50) + "".join(name.ljust(10) for name in variant_names))
+    for i, (message_meta, _) in enumerate(CASES):
+        label = repr(message_meta)[:48].ljust(50)
+        print(label + "".join(("PASS" if results[name][i] else "FAIL").ljust(10) for name in variant_names))
+    print("total".ljust(50) + "".join(f"{sum(results[name])}/{len(CASES)}".ljust(10) for name in variant_names))
+
+
+if __name__ == "__main__":
+    run_eval(sys.argv[1:] or list(VARIANTS))